@@ -2,7 +2,7 @@ import pygame
 from game_data import controller_map, tile_size
 
 class Camera():
-    def __init__(self, surface, screen_rect, room_dim, player, controllers):
+    def __init__(self, surface, screen_rect, room_dim, player, controllers, room_pos=(0, 0)):
         self.player = player  # the target of the camera
         self.target = [self.player.rect.centerx, self.player.rect.centery]  # target position
         self.scroll_value = [0, 0]  # the scroll, shifts the world to create camera effect
@@ -46,9 +46,12 @@ class Camera():
         self.screen_rect = screen_rect
 
         # -- room dimensions and bounding rect --
+        # room_pos is the top left of the room in room coords, only not 0, 0 for infinite rooms that extend left or up
         room_width = room_dim[0]
         room_height = room_dim[1]
-        self.room_rect = pygame.rect.Rect(0, 0, room_width, room_height)
+        self.room_pos = room_pos
+        self.room_rect = pygame.rect.Rect(room_pos[0], room_pos[1], room_width, room_height)
+        self.bounds_rects = []  # rects of rooms streamed around this one, the camera can show them too (see WorldStream)
 
         # -- boundary collision --
         # separate for x and y so that the shorter one doesn't glitch out with too large a tolerance
@@ -106,6 +109,15 @@ class Camera():
     def reset_zoom(self):
         self.zoom = 1
 
+    # carries on from another room's camera when the player walks from that room into this one (see WorldStream)
+    def take_over(self, camera):
+        self.zoom = camera.zoom
+        self.lerp_x = camera.lerp_x
+        self.lerp_y = camera.lerp_y
+        self.fall_offset = camera.fall_offset
+        self.look_up_down_timer = camera.look_up_down_timer
+        self.focus_target = False
+
     def update_target(self):
         self.target = [self.player.rect.centerx, self.player.rect.centery]  # sets target to player pos for modification
 
@@ -138,18 +150,19 @@ class Camera():
         # must MODIFY existing scroll rather than reassigning
         # if edge of screen has exceeded edge of level, reduce scroll based on difference between
         # MODIFED level edge (hence +ing or -ing scroll value as well as just finding dif between edges) and screen edge
+        bounds = self.room_rect.unionall(self.bounds_rects) if self.bounds_rects else self.room_rect
 
         # horizontal
-        if self.screen_rect.left <= self.room_rect.left - self.scroll_value[0]:
-            self.scroll_value[0] += abs(self.room_rect.left - self.screen_rect.left - self.scroll_value[0])
-        if self.screen_rect.right >= self.room_rect.right - self.scroll_value[0]:
-            self.scroll_value[0] += -abs(self.screen_rect.right - self.room_rect.right + self.scroll_value[0])
+        if self.screen_rect.left <= bounds.left - self.scroll_value[0]:
+            self.scroll_value[0] += abs(bounds.left - self.screen_rect.left - self.scroll_value[0])
+        if self.screen_rect.right >= bounds.right - self.scroll_value[0]:
+            self.scroll_value[0] += -abs(self.screen_rect.right - bounds.right + self.scroll_value[0])
 
         # vertical
-        if self.screen_rect.top <= self.room_rect.top - self.scroll_value[1]:
-            self.scroll_value[1] += abs(self.room_rect.top - self.screen_rect.top - self.scroll_value[1])
-        if self.screen_rect.bottom >= self.room_rect.bottom - self.scroll_value[1]:
-            self.scroll_value[1] -= abs(self.screen_rect.bottom - self.room_rect.bottom + self.scroll_value[1])
+        if self.screen_rect.top <= bounds.top - self.scroll_value[1]:
+            self.scroll_value[1] += abs(bounds.top - self.screen_rect.top - self.scroll_value[1])
+        if self.screen_rect.bottom >= bounds.bottom - self.scroll_value[1]:
+            self.scroll_value[1] -= abs(self.screen_rect.bottom - bounds.bottom + self.scroll_value[1])
 
 
 # -- Getters and Setters --
@@ -204,6 +217,10 @@ class Camera():
 
         return self.scroll_value
 
+    # total scroll applied since the camera was created (room rect has been moved by all of it)
+    def get_scroll_total(self):
+        return [self.room_pos[0] - self.room_rect.x, self.room_pos[1] - self.room_rect.y]
+
     # returns zoom value and offset required to zoom into target point (currently center of screen)
     def get_zoom(self):
         # compensates for zooming to origin by offsetting screen with scroll value
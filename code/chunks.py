@@ -0,0 +1,49 @@
+from math import floor
+from game_data import tile_size
+
+
+# creates and removes the sprites of an infinite (chunked) tmx layer as the camera moves, so only the chunks around
+# the screen exist as sprites. The layer only decodes a chunk the first time one of its sprites is made (see pytmx
+# TiledTileLayer.get_chunk), so load time and memory follow where the player has been rather than world size
+class ChunkStreamer:
+    def __init__(self, layer, sprite_group, all_sprites, make_sprites, margin=1):
+        self.layer = layer
+        self.parallax = (layer.parallaxx, layer.parallaxy)
+        self.chunk_width = layer.chunk_width * tile_size  # pixel size of a chunk
+        self.chunk_height = layer.chunk_height * tile_size
+        self.sprite_group = sprite_group  # layer group the chunk sprites are added to
+        self.all_sprites = all_sprites  # room group that scrolls every tile
+        self.make_sprites = make_sprites  # function(chunk key) -> list of sprites at their unscrolled positions
+        # chunks within margin of the screen are loaded. Chunks are only removed once a chunk further away than that,
+        # so moving back and forth over a chunk edge doesn't keep creating and killing the same sprites
+        self.margin = margin
+        self.loaded = {}  # chunk key: sprites
+
+    # returns keys of the layer's chunks within margin chunks of the view rect (layer pixel coords)
+    def get_chunks_near(self, view, margin):
+        x = floor(view.left / self.chunk_width) - margin
+        y = floor(view.top / self.chunk_height) - margin
+        width = floor((view.right - 1) / self.chunk_width) + margin + 1 - x
+        height = floor((view.bottom - 1) / self.chunk_height) + margin + 1 - y
+        return self.layer.chunks_in_area(x * self.layer.chunk_width, y * self.layer.chunk_height,
+                                         width * self.layer.chunk_width, height * self.layer.chunk_height)
+
+    # scroll_total is the camera scroll applied since the room was created, sprites are created at their original
+    # positions and then have it applied so they line up with sprites that have been scrolling all along
+    def update(self, screen_rect, scroll_total):
+        # screen in layer coords, parallax layers only move by a fraction of the scroll
+        view = screen_rect.move(round(scroll_total[0] * self.parallax[0]), round(scroll_total[1] * self.parallax[1]))
+
+        keep = set(self.get_chunks_near(view, self.margin + 1))
+        for key in [key for key in self.loaded if key not in keep]:
+            for sprite in self.loaded.pop(key):
+                sprite.kill()
+
+        for key in self.get_chunks_near(view, self.margin):
+            if key not in self.loaded:
+                sprites = self.make_sprites(key)
+                for sprite in sprites:
+                    sprite.apply_scroll(scroll_total)
+                self.sprite_group.add(sprites)
+                self.all_sprites.add(sprites)
+                self.loaded[key] = sprites
@@ -12,4 +12,17 @@ controller_map = {'square': 0, 'X': 1, 'circle': 2, 'triangle': 3, 'L1': 4, 'R1'
 fonts = {'small': '../assets/fonts/small_font.png',
          'large': '../assets/fonts/large_font.png'}
 
-room_path = '../rooms/'
\ No newline at end of file
+room_path = '../rooms/'
+world_path = '../rooms/tiled_worlds/test_world.world'  # rooms in the world are loaded from the paths it gives them
+prefetch_memory_cap = 32 * 1024 * 1024  # bytes of neighbouring room data loaded ahead of time (their tile data, images are loaded when the room is built)
+# rooms next to each other in the world are streamed in around the current room and walked between without a
+# transition (see WorldStream), rather than only being entered through transitions and doors
+world_streaming = False
+world_stream_margin = tile_size * 16  # px beyond the screen that rooms are streamed in within (dropped at twice it)
+decoration_chunk_size = 256  # px, decoration layers are stored as chunk surfaces of this size (empty ones aren't made)
+room_build_budget = 4  # ms of each frame spent building the next room while the current one fades out
+room_cache_size = 3  # rooms left kept built, so going back to them is instant (each keeps all its layer surfaces)
+
+# load telemetry, a report of where the time of each room load went (also shown in the dev overlay)
+load_report_print = False  # prints the report after every room load
+load_report_file = None  # path of a json lines file every report is appended to, e.g. 'load_reports.jsonl'
\ No newline at end of file
@@ -0,0 +1,130 @@
+import pygame
+import os
+import hashlib
+import struct
+import tempfile
+import zlib
+from tiles import StaticTile
+from pytmx.telemetry import add_surface
+
+# -- LIGHT MASKS --
+# a room's light mask is cut out of its parallax-1 background layers, lights are drawn everywhere but where those layers
+# are. Making one is slow on big rooms and the mask only changes when the room's files do, so it is baked the first time
+# the room is built and saved next to the room file (room_0.tmx -> room_0.lightmask), 1 bit per px. After that it is
+# loaded from there, as long as the room file and every file it is made from (tilesets, images) hash the same
+
+# bump whenever baking changes what the mask looks like, or the file layout changes
+MASK_VERSION = 1
+MAGIC = b'LMASK'
+HEADER = struct.Struct('>5sB20sII')  # magic, version, sha1 of the room's files, width, height
+
+# mask surfaces are 8 bit, palette index 0 (black) cuts light out, 1 (white) is the colorkey
+PALETTE = [(0, 0, 0), (255, 255, 255)]
+PACK = bytes.maketrans(b'\x00\xff', b'01')  # mask surface red channel to bit characters
+UNPACK = bytes.maketrans(b'01', b'\x00\x01')  # and back to palette indexes
+
+
+def get_light_mask_path(room_path):
+    return os.path.splitext(room_path)[0] + '.lightmask'
+
+
+# sha1 of the contents of the room file and every file it is made from, in the order the map uses them
+def get_light_mask_key(tmx_data):
+    key = hashlib.sha1()
+    for path in [tmx_data.filename] + tmx_data.dependencies + tmx_data.image_sources:
+        with open(path, 'rb') as file:
+            key.update(file.read())
+    return key.digest()
+
+
+# a step of Room.build (used with yield from), returns a GroupSingle with a tile holding the room's light mask
+def create_light_mask(tmx_data, background_layers, room_dim):
+    sprite_group = pygame.sprite.GroupSingle()
+
+    # infinite rooms have no room sized layers to mask with, lights are drawn unmasked (sprite is None)
+    if not background_layers or tmx_data.infinite:
+        return sprite_group
+
+    path = get_light_mask_path(tmx_data.filename)
+    key = get_light_mask_key(tmx_data)
+    bits = load_light_mask(path, key, room_dim)
+    if bits is None:
+        bits = yield from bake_light_mask(background_layers, room_dim)
+        save_light_mask(path, key, room_dim, bits)
+    yield
+    mask = get_mask_surface(bits, room_dim)
+    add_surface(mask)
+
+    # create tile holding mask so shifts with rest of world
+    tile = StaticTile((0, 0), (mask.get_width(), mask.get_height()), (1, 1), mask)
+    sprite_group.add(tile)
+
+    return sprite_group
+
+
+# used with yield from, yields between the slower parts of making the mask. Returns the mask packed 1 bit per px
+# (set where there is a parallax-1 layer), rows top to bottom, padded with 0 bits at the start to a whole byte
+def bake_light_mask(background_layers, room_dim):
+    # working surface, ends up with all parallax-1 layers compressed onto it and then masked
+    combined_layers = pygame.Surface(room_dim)
+    combined_layers.set_colorkey((0, 0, 0))
+    add_surface(combined_layers)
+    yield
+
+    # get parallax-1 background layer tiles (each layer is a grid of chunks)
+    for layer in background_layers:
+        chunks = [(chunk.image, chunk.offset) for chunk in layer if chunk.parallax == (1, 1)]
+        if chunks:
+            combined_layers.blits(chunks, False)
+            yield
+
+    # create mask with layer tiles cut out (white = on px, black = off px)
+    mask = pygame.mask.from_surface(combined_layers)
+    yield
+    mask_pixels = pygame.image.tostring(mask.to_surface(), 'RGBX')[::4]
+    yield
+    return int(mask_pixels.translate(PACK), 2).to_bytes(get_packed_size(room_dim), 'big')
+
+
+def get_packed_size(room_dim):
+    return (room_dim[0] * room_dim[1] + 7) // 8
+
+
+# unpacks a baked mask into a surface, black where light is cut out and colorkeyed white where it isn't
+def get_mask_surface(bits, room_dim):
+    mask_pixels = format(int.from_bytes(bits, 'big'), '0{}b'.format(room_dim[0] * room_dim[1]))
+    mask = pygame.image.fromstring(mask_pixels.encode().translate(UNPACK), tuple(room_dim), 'P')
+    mask.set_palette(PALETTE)
+    mask.set_colorkey(PALETTE[1])
+    return mask
+
+
+# the room's packed mask from its file, or None if there isn't one baked from the room's current files
+def load_light_mask(path, key, room_dim):
+    try:
+        with open(path, 'rb') as file:
+            magic, version, file_key, width, height = HEADER.unpack(file.read(HEADER.size))
+            if (magic, version, file_key, [width, height]) != (MAGIC, MASK_VERSION, key, list(room_dim)):
+                return None
+            bits = zlib.decompress(file.read())
+    except (OSError, struct.error, zlib.error):
+        return None  # baked again (and saved over the file)
+    if len(bits) != get_packed_size(room_dim):
+        return None
+    return bits
+
+
+# failing to save isn't an error (e.g. a read only install), the mask is just baked again next time
+def save_light_mask(path, key, room_dim, bits):
+    try:
+        file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(file_descriptor, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, MASK_VERSION, key, room_dim[0], room_dim[1]))
+            file.write(zlib.compress(bits))
+        # replaced, not written in place, so a room never loads half a file
+        os.replace(temp_path, path)
+    except OSError:
+        os.remove(temp_path)
@@ -3,8 +3,12 @@
 
 # screen resizing tut, dafluffypotato: https://www.youtube.com/watch?v=edJZOQwrMKw
 
-import pygame, sys, time
+import pygame, sys, time, os
 from room import Room
+from world import World
+from prefetch import RoomPrefetcher
+from room_cache import RoomCache
+from world_stream import WorldStream
 from text import Font
 from game_data import *
 from support import resource_path
@@ -49,9 +53,18 @@ for joystick in joysticks:
 font = Font(fonts['small'], 'white')
 
 
-# creates path to new room based on root room path and desired room
+# world
+world = World(world_path)
+
+
+# creates path to new room from the world, or if it isn't in the world, root room path and desired room
+# rooms exported from tiled as json (.tmj) are used over the .tmx when both exist
 def get_relative_room_path(room):
-    return room_path + room + '.tmx'
+    path = world.get_room_path(room) or room_path + room + '.tmx'
+    json_path = os.path.splitext(path)[0] + '.tmj'
+    if os.path.exists(resource_path(json_path)):
+        return json_path
+    return path
 
 
 def main_menu():
@@ -68,6 +81,23 @@ def game():
 
     previous_room = 'room_0'
     room = Room(dt, fps, get_relative_room_path(previous_room), screen, screen_rect, joysticks, previous_room)
+    next_room = None  # room being built a slice each frame during a room transition
+
+    # rooms recently left, kept built for going back to
+    room_cache = RoomCache(room_cache_size)
+
+    # loads the rooms the current room leads to in the background, ready for the transition (rooms that are still
+    # built in the room cache don't need it)
+    prefetcher = RoomPrefetcher(world, get_relative_room_path, prefetch_memory_cap)
+    prefetcher.prefetch(previous_room, room.get_neighbouring_rooms())
+
+    # rooms streamed around the current room are built a slice each frame
+    def create_streamed_room(name, entered_from, dt, fps):
+        return Room(dt, fps, get_relative_room_path(name), screen, screen_rect, joysticks, entered_from, time_sliced=True, tmx_data=prefetcher.take(name))
+
+    world_stream = None
+    if world_streaming:
+        world_stream = WorldStream(world, room, previous_room, create_streamed_room, get_relative_room_path, room_cache, world_stream_margin, room_build_budget)
 
     running = True
     while running:
@@ -85,6 +115,7 @@ def game():
         for event in pygame.event.get():
 
             if event.type == pygame.QUIT:
+                prefetcher.shutdown()
                 pygame.quit()
                 sys.exit()
 
@@ -96,6 +127,7 @@ def game():
                     pass
                 elif event.key == pygame.K_COMMA:
                     running = False
+                    prefetcher.shutdown()
                     pygame.quit()
                     sys.exit()
                 # TODO Test only, remove
@@ -117,6 +149,7 @@ def game():
             elif event.type == pygame.JOYBUTTONDOWN:
                 if event.button == controller_map['left_analog_press']:
                     running = False
+                    prefetcher.shutdown()
                     pygame.quit()
                     sys.exit()
 
@@ -124,13 +157,39 @@ def game():
 
         # -- Update --
         screen.fill((0, 0, 0))
-        room.update(dt, fps)  # runs level processes
-        # if player has hit a room transition in the room, change the active room
-        room_transition = room.room_transitions()
-        if room_transition:
-            del room  # make sure the level instance is deleted properly, freeing memory
-            room = Room(dt, fps, get_relative_room_path(room_transition), screen, screen_rect, joysticks, previous_room)
-            previous_room = room_transition  # updates previous room
+        if not next_room:
+            room.update(dt, fps)  # runs level processes
+            # the player may have walked into one of the rooms streamed around this one
+            if world_stream:
+                world_stream.update(dt, fps)
+                if world_stream.room is not room:
+                    room = world_stream.room
+                    previous_room = world_stream.name
+                    prefetcher.prefetch(previous_room, [name for name in room.get_neighbouring_rooms() if get_relative_room_path(name) not in room_cache])
+            # if player has hit a room transition in the room, start building the new room
+            room_transition = room.room_transitions()
+            if room_transition:
+                next_room_path = get_relative_room_path(room_transition)
+                # a cached room is already built, so it takes over on the next frame
+                next_room = room_cache.take(next_room_path)
+                if next_room:
+                    next_room.reactivate(dt, fps, previous_room)
+                else:
+                    next_room = Room(dt, fps, next_room_path, screen, screen_rect, joysticks, previous_room, time_sliced=True, tmx_data=prefetcher.take(room_transition))
+                previous_room = room_transition  # updates previous room
+        else:
+            # the current room stops and fades out while the new one is built over several frames (so no single frame
+            # hitches), the new room only becomes active once it is complete
+            if room.fade_timer < 1:
+                room.fade_out(dt)
+            room.draw()
+            if next_room.continue_build(room_build_budget):
+                room_cache.add(room)  # the room left is kept built, the cache drops (frees) the least recently left
+                room = next_room
+                next_room = None
+                if world_stream:
+                    world_stream.set_room(room, previous_room)
+                prefetcher.prefetch(previous_room, [name for name in room.get_neighbouring_rooms() if get_relative_room_path(name) not in room_cache])
 
         font.render(f'FPS: {str(clock.get_fps())}', screen, (0, 0))
 
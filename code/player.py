@@ -1,6 +1,6 @@
 import pygame
+import copy
 from game_data import tile_size, controller_map
-from tiles import StaticTile
 from lighting import Light
 from support import import_folder
 
@@ -37,7 +37,6 @@ class Player(pygame.sprite.Sprite):
         self.rect = pygame.Rect(spawn.x, spawn.y, self.image.get_width(), self.image.get_height())
         self.lights = [Light(self.surface, self.rect.center, (15, 15, 15), False, 40, 30, 0.02),
                        Light(self.surface, self.rect.center, (20, 25, 25), False, 25, 20, 0.02)]
-        self.light_background_mask = self.get_background_light_mask_tile(room.background_layers)
 
         # - hitboxes  -
         self.hitboxes = {
@@ -163,30 +162,6 @@ class Player(pygame.sprite.Sprite):
             hitboxes[hitbox] = import_folder(full_path, 'surface')
         return hitboxes
 
-    def get_background_light_mask_tile(self, background_layers):
-        sprite_group = pygame.sprite.GroupSingle()
-
-        # working surface, ends up with all parallax-1 layers compressed onto it and then masked
-        combined_layers = pygame.Surface((background_layers[0].sprite.image.get_width(),
-                                          background_layers[0].sprite.image.get_height()))
-        combined_layers.set_colorkey((0, 0, 0))
-
-        # get parallax-1 background layer tiles
-        for layer_tile in background_layers:
-            if layer_tile.sprite.parallax == (1, 1):
-                combined_layers.blit(layer_tile.sprite.image, (0, 0))
-
-        # create mask with layer tiles cut out (white = on px, leave off px for cutting out light surfs)
-        mask = pygame.mask.from_surface(combined_layers)
-        mask = mask.to_surface()
-        mask.set_colorkey((255, 255, 255))
-
-        # create tile holding mask so shifts with rest of world
-        tile = StaticTile((0, 0), (mask.get_width(), mask.get_height()), (1, 1), mask)
-        sprite_group.add(tile)
-
-        return sprite_group
-
 # -- checks --
 
     def get_input(self, dt, tiles):
@@ -354,6 +329,17 @@ class Player(pygame.sprite.Sprite):
         self.jumping = False  # end any jumps on respawn
         self.respawn = False
 
+    # carries the player over from the player of another room when walking from that room into this one (see
+    # WorldStream). Everything is copied but what belongs to the room, the animations and lights are shared
+    def take_over(self, player):
+        room_attributes = ('room', 'surface', 'controllers')
+        shared_attributes = ('animations', 'image', 'lights')
+        state = {key: value for key, value in player.__dict__.items()
+                 if not key.startswith('_') and key not in room_attributes + shared_attributes}
+        self.__dict__.update(copy.deepcopy(state))  # deep copied together so hitbox stays one of hitboxes
+        for key in shared_attributes:
+            setattr(self, key, getattr(player, key))
+
 # -- movement methods --
 
     def dash(self, dt):
@@ -486,7 +472,7 @@ class Player(pygame.sprite.Sprite):
         # - exception case (if not crouching but should be forced to cause under platform) -
         else:
             # if normal hitbox top collides with a tile, make crouched
-            for tile in tiles:
+            for tile in self.get_tiles_near(tiles, self.hitboxes["normal"]):
                 if tile.hitbox.colliderect(self.hitboxes["normal"]):
                     if abs(tile.hitbox.bottom - self.hitboxes["normal"].top) < self.collision_tolerance:
                         # change to crouched hitbox and sync to the same pos as previous hitbox (using rect midbottom)
@@ -536,6 +522,18 @@ class Player(pygame.sprite.Sprite):
 
 # -- update methods --
 
+    # tiles of the colliders that touch rect, in the order the tiles were made (row-major) so collisions resolve the same
+    # as checking every tile. Infinite rooms collide with their tiles directly, a tile stands for itself
+    @staticmethod
+    def get_tiles_near(colliders, rect):
+        tiles = []
+        for collider in colliders:
+            if collider.hitbox.colliderect(rect):
+                tiles.extend(getattr(collider, 'tiles', (collider,)))
+        if len(tiles) > 1:
+            tiles.sort(key=lambda tile: (tile.rect.y, tile.rect.x))
+        return tiles
+
     # checks collision for a given hitbox (the player's) against given tiles on the x
     def collision_x(self, tiles):
         collision_offset = [0, 0]  # position hitbox is to be corrected to after checks
@@ -549,7 +547,7 @@ class Player(pygame.sprite.Sprite):
         bottom = False
         bottom_margin = False
 
-        for tile in tiles:
+        for tile in self.get_tiles_near(tiles, self.hitbox):
             if tile.hitbox.colliderect(self.hitbox):
                 # - normal collision checks -
                 # abs ensures only the desired side registers collision
@@ -616,7 +614,7 @@ class Player(pygame.sprite.Sprite):
 
         bonk = False
 
-        for tile in tiles:
+        for tile in self.get_tiles_near(tiles, self.hitbox):
             if tile.hitbox.colliderect(self.hitbox):
                 # abs ensures only the desired side registers collision
                 if abs(tile.hitbox.top - self.hitbox.bottom) < self.collision_tolerance:
@@ -706,9 +704,6 @@ class Player(pygame.sprite.Sprite):
 
     def apply_scroll(self, scroll_value):
         # must be here for when camera is initally created in room and scroll value is applied to all tiles
-        # must be applied to mask as well otherwise it is consistently out by initial scroll value
-        self.light_background_mask.sprite.apply_scroll(scroll_value)
-
         self.rect.x -= int(scroll_value[0])
         self.rect.y -= int(scroll_value[1])
         self.sync_hitbox()
@@ -761,6 +756,6 @@ class Player(pygame.sprite.Sprite):
     def draw(self):
         # draw lights
         for light in self.lights:
-            light.draw(self.light_background_mask.sprite)
+            light.draw(self.room.light_mask.sprite)  # the room's mask, shared by all its lights
         # draw player
         self.surface.blit(self.image, self.rect)
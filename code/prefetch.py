@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pytmx import TiledTileLayer
+from room import Room
+
+
+# loads the tmx data of the rooms next to the current one on a background thread, so a room transition only has to
+# build the room from it. Images aren't loaded with it, they are converted for the display, which only the main thread
+# can do (and the tileset images are shared by every room), so the room loads them when it is built.
+# Loaded rooms are kept in a cache of up to memory_cap bytes, the least recently prefetched are dropped first
+class RoomPrefetcher:
+    def __init__(self, world, get_room_path, memory_cap):
+        self.world = world  # orders the rooms to prefetch, closest first
+        self.get_room_path = get_room_path  # function(room name) -> room file path, the same one main uses
+        self.memory_cap = memory_cap
+
+        # one worker, so prefetching never takes more than one core away from the game
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch')
+        self.lock = threading.Lock()  # guards the cache, which the worker adds to
+        self.loading = {}  # room name: Future of its tmx data, for rooms queued or being loaded
+        self.cache = OrderedDict()  # room name: (tmx data, size in bytes), least recently prefetched first
+        self.cache_size = 0
+
+    # starts loading the rooms reachable from the current room that aren't loaded or loading already. Rooms queued
+    # for a previous room that aren't reachable from this one are cancelled (if they haven't started)
+    def prefetch(self, current_room, room_names):
+        room_names = sorted(set(room_names) - {current_room}, key=lambda name: self.world.get_room_distance(current_room, name))
+        for name in list(self.loading):
+            # finished rooms are in the cache (unless it dropped them), so they are only kept track of there
+            if self.loading[name].done() or (name not in room_names and self.loading[name].cancel()):
+                del self.loading[name]
+
+        for name in room_names:
+            with self.lock:
+                if name in self.cache:
+                    self.cache.move_to_end(name)
+                    continue
+            if name not in self.loading:
+                self.loading[name] = self.executor.submit(self.load, name, self.get_room_path(name))
+
+    # returns the prefetched tmx data of a room and removes it from the prefetcher (the room built from it changes
+    # it), or None if the room hasn't been prefetched. Waits for the room if it is being loaded right now
+    def take(self, name):
+        future = self.loading.pop(name, None)
+        if future is not None and not future.cancel():
+            try:
+                future.result()
+            except Exception:
+                pass  # the room is loaded again on the main thread, where the error is raised
+        with self.lock:
+            tmx_data, size = self.cache.pop(name, (None, 0))
+            self.cache_size -= size
+        return tmx_data
+
+    # runs on the worker thread
+    def load(self, name, path):
+        tmx_data = Room.load_map(path, load_images=False)
+        size = self.get_tile_data_size(tmx_data)
+
+        with self.lock:
+            self.cache[name] = (tmx_data, size)
+            self.cache_size += size
+            # drop the least recently prefetched rooms until back under the cap (this room too, if it alone is over)
+            while self.cache_size > self.memory_cap:
+                _, (_, dropped_size) = self.cache.popitem(last=False)
+                self.cache_size -= dropped_size
+        return tmx_data
+
+    # bytes of tile gids held by the tmx data's tile layers (chunks counted as if decoded)
+    @staticmethod
+    def get_tile_data_size(tmx_data):
+        size = 0
+        for layer in tmx_data.layers:
+            if isinstance(layer, TiledTileLayer):
+                size += layer.gids.itemsize * len(layer.gids)
+                size += len(layer.chunks) * layer.chunk_width * layer.chunk_height * layer.gids.itemsize
+        return size
+
+    # stops the worker after the room it is loading, rooms that haven't started are dropped
+    def shutdown(self):
+        for future in self.loading.values():
+            future.cancel()
+        self.loading.clear()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,194 @@
+"""
+Compiled map cache for pytmx.
+
+Parsing a .tmx file means parsing the xml, every external .tsx it references,
+decoding the layer data and registering every GID.  None of that changes unless
+the files do, so after a map has been parsed the result is written to a binary
+file next to the map (``room_0.tmx`` -> ``room_0.tmxc``) and the next load of
+the same map restores it from there instead.
+
+The cache file holds a small pickled header describing the files the map was
+built from (and the loader options that change the parsed result), followed by
+the pickled map state itself, zlib compressed (layer grids are mostly zeros).
+The header is checked before the state is read.  A source file is considered
+unchanged when its mtime and size match, or failing that, when its sha1 matches
+the one recorded at save time (so a checkout or copy that only touches mtimes
+does not throw the cache away).
+
+Images are never cached; TiledMap.reload_images runs as normal after a restore.
+
+"""
+import hashlib
+import io
+import logging
+import os
+import pickle
+import tempfile
+import zlib
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["cache_path", "load_map_cache", "save_map_cache"]
+
+# bump whenever the pickled layout of the Tiled* classes changes
+CACHE_VERSION = 7
+MAGIC = b"PTMXC"
+
+# TiledMap attributes that are loader options or loaded images, not parse results
+_unsaved_attributes = {
+    "filename",
+    "custom_property_filename",
+    "image_loader",
+    "optional_gids",
+    "load_all_tiles",
+    "preload_images",
+    "object_records",
+    "invert_y",
+    "use_cache",
+    "stream",
+    "deferred",
+    "load_images",
+    "chunk_cache_size",
+    "images",
+    "image_sources",
+    "_tileset_loaders",
+    "_gid_tilesets",
+    "_tileset_sources",
+    "_layer_data",
+}
+
+# the map is referenced (as ``parent``) by nearly every element, it is stored
+# as a persistent id and swapped for the map being loaded into on restore
+_map_pid = "map"
+
+
+def cache_path(filename: str) -> str:
+    """Return the path of the compiled cache file for a map file."""
+    return filename + "c"
+
+
+def _stamp(path: str):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _digest(path: str) -> str:
+    with open(path, "rb") as fp:
+        return hashlib.sha1(fp.read()).hexdigest()
+
+
+def _options(tiled_map):
+    """Loader options that change what parse_xml produces."""
+    return (
+        bool(tiled_map.invert_y),
+        bool(tiled_map.allow_duplicate_names),
+        tiled_map.custom_property_filename,
+        bool(tiled_map.object_records),
+    )
+
+
+def _sources(tiled_map):
+    """Return [(path, stamp, digest), ...] for every file the map was parsed from."""
+    paths = [tiled_map.filename]
+    if tiled_map.custom_property_filename:
+        paths.append(tiled_map.custom_property_filename)
+    for path in tiled_map.dependencies:
+        if path not in paths:
+            paths.append(path)
+    return [(os.path.abspath(path), _stamp(path), _digest(path)) for path in paths]
+
+
+def _sources_unchanged(sources) -> bool:
+    for path, stamp, digest in sources:
+        try:
+            if _stamp(path) == stamp:
+                continue
+            if _digest(path) == digest:
+                continue
+        except OSError:
+            pass
+        logger.debug("map cache is stale, {0} changed".format(path))
+        return False
+    return True
+
+
+def load_map_cache(tiled_map) -> bool:
+    """Restore a parsed map from its cache file.
+
+    Args:
+        tiled_map (TiledMap): map with ``filename`` set, not yet parsed.
+
+    Returns:
+        bool: True if the map was restored, False if there is no valid cache.
+
+    """
+    path = cache_path(tiled_map.filename)
+    try:
+        fp = open(path, "rb")
+    except OSError:
+        return False
+
+    with fp:
+        try:
+            if fp.read(len(MAGIC)) != MAGIC:
+                return False
+            header = pickle.load(fp)
+            if header["version"] != CACHE_VERSION:
+                return False
+            if header["options"] != _options(tiled_map):
+                return False
+            if not _sources_unchanged(header["sources"]):
+                return False
+
+            unpickler = pickle.Unpickler(io.BytesIO(zlib.decompress(fp.read())))
+            unpickler.persistent_load = lambda pid: tiled_map
+            state = unpickler.load()
+        except Exception:
+            # stale class layouts, truncated writes, etc.  the map is simply parsed again
+            logger.debug("cannot read map cache {0}".format(path), exc_info=True)
+            return False
+
+    tiled_map.__dict__.update(state)
+    return True
+
+
+def save_map_cache(tiled_map) -> None:
+    """Write the parsed state of a map to its cache file.
+
+    Must be called after parsing and before images are loaded.  Failing to
+    write the cache is not an error, the map will just be parsed next time.
+
+    Args:
+        tiled_map (TiledMap): the freshly parsed map.
+
+    """
+    path = cache_path(tiled_map.filename)
+    state = {
+        k: v for k, v in tiled_map.__dict__.items() if k not in _unsaved_attributes
+    }
+    try:
+        header = {
+            "version": CACHE_VERSION,
+            "options": _options(tiled_map),
+            "sources": _sources(tiled_map),
+        }
+        body = io.BytesIO()
+        pickler = pickle.Pickler(body, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = lambda obj: _map_pid if obj is tiled_map else None
+        pickler.dump(state)
+
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(MAGIC)
+                pickle.dump(header, fp, pickle.HIGHEST_PROTOCOL)
+                fp.write(zlib.compress(body.getbuffer(), 1))
+            # replace, not write in place, so concurrent loads never see half a file
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    except Exception:
+        logger.info("cannot write map cache {0}".format(path), exc_info=True)
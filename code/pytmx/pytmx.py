@@ -24,24 +24,44 @@ import gzip
 import logging
 import os
 import sys  # AT 17/07/2022 - import sys for modifying path in an executable to an absolute path from the base folder
-import struct
+import threading
 import zlib
+from array import array
 from base64 import b64decode
-from collections import defaultdict, namedtuple
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict, deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
 from itertools import chain, product
 from math import cos, radians, sin
-from operator import attrgetter
+from types import MappingProxyType
 from typing import List, Tuple, Optional, Sequence, Union, Dict, Iterable
 from xml.etree import ElementTree
 import json
+import keyword
 from copy import deepcopy
 
+from .map_cache import load_map_cache, save_map_cache
+from .telemetry import load_phase, load_span
+from .tiled_json import is_json_file, load_json_map, load_json_template, load_json_tileset
+
 # for type hinting
 try:
     import pygame
 except ImportError:
     pygame = None
 
+# optional, used for bulk gid remapping and 2d layer views
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# optional, needed for zstd compressed layer data
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 __all__ = (
     "TileFlags",
     "TiledElement",
@@ -49,8 +69,11 @@ __all__ = (
     "TiledMap",
     "TiledObject",
     "TiledObjectGroup",
+    "TiledObjectRecord",
     "TiledTileLayer",
+    "TiledChunk",
     "TiledClassType",
+    "TiledImages",
     "TiledTileset",
     "convert_to_bool",
     "resolve_to_class",
@@ -136,27 +159,78 @@ def decode_gid(raw_gid: int) -> Tuple[int, TileFlags]:
 
 
 def reshape_data(
-    gids: List[int],
+    gids: Sequence[int],
     width: int,
-) -> List[List[int]]:
-    """Change 1D list to 2d list
+) -> List[Sequence[int]]:
+    """Change 1D sequence to 2d list of rows
+
+    Rows are slices of `gids`, so a memoryview gives rows that are views
+    into the original buffer rather than copies.
 
     Args:
-        gids (List[int]): List of gid ints.
+        gids (Sequence[int]): Sequence of gid ints.
         width (int): Width of each row.
 
     Returns:
-        List[List[int]]: 2D nested list object.
+        List[Sequence[int]]: 2D nested list object.
 
     """
     return [gids[i : i + width] for i in range(0, len(gids), width)]
 
 
+def decompress_data(data: bytes, compression: Optional[str]) -> bytes:
+    """Return decompressed layer data.
+
+    Args:
+        data (bytes): base64 decoded layer data.
+        compression (Optional[str]): gzip, zlib, zstd or None.
+
+    Raises:
+        ValueError: If the compression is not supported (zstd needs the
+            zstandard module).
+
+    Returns:
+        bytes: The raw layer data.
+
+    """
+    if not compression:
+        return data
+    if compression == "zlib":
+        return zlib.decompress(data)
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "zstd" and zstandard is not None:
+        # a stream reader, tiled does not always write the content size in the frame
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    raise ValueError(f"layer compression {compression} is not supported.")
+
+
+def gids_from_bytes(data: bytes) -> Sequence[int]:
+    """Return raw layer data as a sequence of GIDs, without copying it.
+
+    Args:
+        data (bytes): Little endian unsigned 32 bit GIDs.
+
+    Returns:
+        Sequence[int]: memoryview of the data cast to unsigned ints.
+
+    """
+    if len(data) % 4:
+        raise ValueError("layer data is not a whole number of GIDs.")
+    # tmx data is little endian
+    if sys.byteorder == "big":
+        gids = array("I")
+        gids.frombytes(data)
+        gids.byteswap()
+        return memoryview(gids)
+    return memoryview(data).cast("I")
+
+
 def unpack_gids(
     text: str,
     encoding: Optional[str] = None,
     compression: Optional[str] = None,
-) -> List[int]:
+) -> Sequence[int]:
     """Return all gids from encoded/compressed layer data
 
     Args:
@@ -165,25 +239,163 @@ def unpack_gids(
         compression (Optional[str]): Compression used.
 
     Returns:
-        List[int]: List of all the GIDs in the layer.
+        Sequence[int]: Unsigned ints of all the GIDs in the layer, a memoryview
+            over the decompressed data for base64 layers, an array for csv.
 
     """
     if encoding == "base64":
-        data = b64decode(text)
-        if compression == "gzip":
-            data = gzip.decompress(data)
-        elif compression == "zlib":
-            data = zlib.decompress(data)
-        elif compression:
-            raise ValueError(f"layer compression {compression} is not supported.")
-        fmt = "<%dL" % (len(data) // 4)
-        return list(struct.unpack(fmt, data))
+        return gids_from_bytes(decompress_data(b64decode(text), compression))
     elif encoding == "csv":
-        return [int(i) for i in text.split(",")]
+        return array("I", map(int, text.split(",")))
     elif encoding:
         raise ValueError(f"layer encoding {encoding} is not supported.")
 
 
+# compressed layers are decoded on a small shared thread pool, zlib (and gzip,
+# zstd) release the GIL while decompressing so several layers decode at once
+decode_workers = min(4, os.cpu_count() or 1)
+_decode_pool = None
+# maps are loaded from several threads at once (the room prefetcher), only one of them makes the pool
+_decode_pool_lock = threading.Lock()
+
+
+def unpack_gids_async(
+    text: str,
+    encoding: Optional[str] = None,
+    compression: Optional[str] = None,
+) -> Optional[Future]:
+    """Start decoding compressed layer data in the background.
+
+    Args:
+        text (str): Layer data in text format.
+        encoding (Optional[str]): Encoding used.
+        compression (Optional[str]): Compression used.
+
+    Returns:
+        Optional[Future]: Future of the unpack_gids result, or None if the data
+            is not compressed (it is quicker to decode it in place).
+
+    """
+    global _decode_pool
+    if not compression or decode_workers < 2:
+        return None
+    if _decode_pool is None:
+        with _decode_pool_lock:
+            if _decode_pool is None:
+                _decode_pool = ThreadPoolExecutor(decode_workers, thread_name_prefix="pytmx-decode")
+    return _decode_pool.submit(unpack_gids, text, encoding, compression)
+
+
+# templates are shared by many maps (and many objects), parsed tx files are kept
+# for the life of the process: {abspath: ((mtime_ns, size), template)}
+_template_file_cache = dict()
+
+Template = namedtuple("Template", ["object", "tileset_source", "firstgid"])
+
+
+def load_template_file(path: str) -> Template:
+    """Return the object of a Tiled template (.tx or .tj) file.
+
+    The file is parsed once per process and reparsed only if its mtime or
+    size changes.  The returned element is shared and must not be modified.
+
+    Args:
+        path (str): Path of the .tx or .tj file.
+
+    Returns:
+        Template: The <object> element, and the absolute path and firstgid of
+            the template's tileset (None and 0 if it has none).
+
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    stamp = st.st_mtime_ns, st.st_size
+    cached = _template_file_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with load_span("tx parse"):
+        if is_json_file(path):
+            root = load_json_template(path)
+        else:
+            root = ElementTree.parse(path).getroot()
+    tileset = root.find("tileset")
+    if tileset is not None and tileset.get("source"):
+        tileset_source = os.path.abspath(
+            os.path.join(os.path.dirname(path), tileset.get("source"))
+        )
+        firstgid = int(tileset.get("firstgid"))
+    else:
+        tileset_source, firstgid = None, 0
+    template = Template(root.find("object"), tileset_source, firstgid)
+    _template_file_cache[path] = stamp, template
+    return template
+
+
+def index_gids(gids: array) -> Dict[int, array]:
+    """Return an inverted index of layer data: GID -> tile indices.
+
+    Args:
+        gids (array): Row-major unsigned int array of GIDs.
+
+    Returns:
+        Dict[int, array]: Ascending flat indices (y * width + x) of the tiles
+            with each GID.  Empty tiles (GID 0) are left out.
+
+    """
+    index = dict()
+    if numpy is not None and gids:
+        flat = numpy.frombuffer(gids, dtype=numpy.uint32)
+        order = numpy.argsort(flat, kind="stable").astype(numpy.uint32)
+        ordered = flat[order]
+        starts = numpy.flatnonzero(numpy.diff(ordered)) + 1
+        for gid, run in zip(ordered[numpy.r_[0, starts]], numpy.split(order, starts)):
+            if gid:
+                index[int(gid)] = array("I", run.tobytes())
+        return index
+
+    for i, gid in enumerate(gids):
+        if gid:
+            try:
+                index[gid].append(i)
+            except KeyError:
+                index[gid] = array("I", (i,))
+    return index
+
+
+# external tilesets are shared by many maps, parsed tsx files are kept for the
+# life of the process: {abspath: ((mtime_ns, size), root element)}
+_tileset_file_cache = dict()
+
+
+def load_tileset_file(path: str) -> ElementTree.Element:
+    """Return the root element of an external tileset file.
+
+    The file is parsed once per process and reparsed only if its mtime or
+    size changes.  The returned element is shared and must not be modified.
+
+    Args:
+        path (str): Path of the .tsx or .tsj file.
+
+    Returns:
+        ElementTree.Element: The <tileset> element.
+
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    stamp = st.st_mtime_ns, st.st_size
+    cached = _tileset_file_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with load_span("tsx parse"):
+        if is_json_file(path):
+            root = load_json_tileset(path)
+        else:
+            root = ElementTree.parse(path).getroot()
+    _tileset_file_cache[path] = stamp, root
+    return root
+
+
 def convert_to_bool(value: str) -> bool:
     """Convert a few common variations of "true" and "false" to boolean
 
@@ -276,6 +488,7 @@ types.update(
         "height": float,
         "hexsidelength": float,
         "id": int,
+        "infinite": convert_to_bool,
         "italic": convert_to_bool,
         "kerning": convert_to_bool,
         "margin": int,
@@ -300,6 +513,8 @@ types.update(
         "spacing": int,
         "staggeraxis": str,
         "staggerindex": str,
+        "startx": int,
+        "starty": int,
         "strikeout": convert_to_bool,
         "terrain": str,
         "tile": int,
@@ -336,11 +551,13 @@ prop_type = {
 }
 
 
-def parse_properties(node: ElementTree.Element, customs: dict = None) -> Dict:
+def parse_properties(node: ElementTree.Element, customs: dict = None, member_types: dict = None) -> Dict:
     """Parse a Tiled xml node and return a dict.
 
     Args:
         node (ElementTree.Element): Etree element to inspect.
+        customs (dict): Custom types by name.
+        member_types (dict): Custom type names of the class members, when node is a class property.
 
     Returns:
         Dict: Dictionary of the properties, as set in the Tiled editor.
@@ -360,8 +577,10 @@ def parse_properties(node: ElementTree.Element, customs: dict = None) -> Dict:
                     )
                 )
             if "class" == subnode.get("type"):
-                new = resolve_to_class(subnode.get("propertytype"), customs)
-                properties = parse_properties(subnode, customs)
+                # AT 18/10/2026 - json maps don't name the type of class members, it comes from the enclosing class
+                type_name = subnode.get("propertytype") or (member_types or {}).get(subnode.get("name"))
+                new = resolve_to_class(type_name, customs)
+                properties = parse_properties(subnode, customs, new._member_types)
                 for key in properties.keys():
                     setattr(new, key, properties[key])
 
@@ -449,10 +668,13 @@ class TiledElement:
         self.properties = properties
 
     def __getattr__(self, item):
+        # AT 18/10/2026 - properties read through __dict__ so lookups made before __init__ has run (pickle looks
+        # up __setstate__ while restoring a cached map) raise AttributeError instead of recursing
+        properties = self.__dict__.get("properties", {})
         try:
-            return self.properties[item]
+            return properties[item]
         except KeyError:
-            if self.properties.get("name", None):
+            if properties.get("name", None):
                 raise AttributeError(
                     "Element '{0}' has no property {1}".format(self.name, item)
                 )
@@ -478,10 +700,66 @@ class TiledClassType:
 
         """
         self.name = name
+        # AT 18/10/2026 - custom type names of class members, which json maps leave out (see parse_properties)
+        self._member_types = {
+            member["name"]: member["propertyType"]
+            for member in members
+            if member.get("type") == "class" and "propertyType" in member
+        }
         for member in members:
             setattr(self, member["name"], member["value"])
 
 
+class LazyImage:
+    """An image slot that calls its loader the first time it is read.
+
+    Stored in TiledImages so images are only sliced and converted for the
+    tiles a map actually draws.
+
+    """
+
+    __slots__ = ("loader", "args")
+
+    def __init__(self, loader, *args) -> None:
+        self.loader = loader
+        self.args = args
+
+    def load(self):
+        return self.loader(*self.args)
+
+
+class TiledImages(list):
+    """List of map images, indexed by GID, that loads LazyImage slots on access.
+
+    Reading a slot replaces its LazyImage with the loaded image, so each tile
+    is loaded at most once.
+
+    """
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        image = list.__getitem__(self, index)
+        if type(image) is LazyImage:
+            image = image.load()
+            list.__setitem__(self, index, image)
+        return image
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def preload(self) -> None:
+        """Load every image now rather than on first access."""
+        for _ in self:
+            pass
+
+
+def load_image_file(image_loader, filename: str, colorkey):
+    """Load a whole image file (image layers, tiles with their own image)."""
+    return image_loader(filename, colorkey)()
+
+
 class TiledMap(TiledElement):
     """Contains the layers, objects, and images from a Tiled .tmx map."""
 
@@ -500,7 +778,16 @@ class TiledMap(TiledElement):
             optional_gids (???): Load specific tile image GID, even if never used.
             invert_y (bool): Invert the y axis.
             load_all_tiles (bool): Load all tile images, even if never used.
+            preload_images (bool): Load every image in reload_images, rather than the first time it is used.
+            object_records (bool): Replace objects that have a class with slotted records (see TiledObjectRecord,
+                they are not TiledObject instances and their properties are read-only).
             allow_duplicate_names (bool): Allow duplicates in objects' metadata.
+            cache (bool): Load from / save to a compiled cache file next to the map (see map_cache).
+            stream (bool): Parse the file in a single streaming pass (see iterparse_xml).
+            deferred (bool): Don't load the file here, the caller loads it with iterload.
+            load_images (bool): Load the images at the end of the load.  If False the caller must call
+                reload_images before using them (e.g. maps loaded off the thread that owns the display).
+            chunk_cache_size (int): Decoded chunks kept per layer of an infinite map.
 
         """
         TiledElement.__init__(self)
@@ -511,17 +798,31 @@ class TiledMap(TiledElement):
         # optional keyword arguments checked here
         self.optional_gids = kwargs.get("optional_gids", set())
         self.load_all_tiles = kwargs.get("load_all", True)
+        self.preload_images = kwargs.get("preload_images", False)
+        self.object_records = kwargs.get("object_records", False)
         self.invert_y = kwargs.get("invert_y", True)
+        self.use_cache = kwargs.get("cache", False)
+        self.stream = kwargs.get("stream", False)
+        self.deferred = kwargs.get("deferred", False)
+        self.load_images = kwargs.get("load_images", True)
+        self.chunk_cache_size = kwargs.get("chunk_cache_size", 64)
 
         # allow duplicate names to be parsed and loaded
         TiledElement.allow_duplicate_names = kwargs.get("allow_duplicate_names", False)
 
         self.layers = list()  # all layers in proper order
         self.tilesets = list()  # TiledTileset objects
+        self.tileset_firstgids = list()  # sorted firstgids, for bisecting (see add_tileset)
+        self.tilesets_by_firstgid = list()  # tilesets in the same order
+        self._gid_tilesets = dict()  # gid: tileset, memo of get_tileset_from_gid
         self.tile_properties = dict()  # tiles that have properties
         self.layernames = dict()
+        self.layers_by_id = dict()
         self.objects_by_id = dict()
         self.objects_by_name = dict()
+        self.dependencies = list()  # other files (tsx, tx, etc.) the map was parsed from
+        self._tileset_sources = dict()  # tsx abspath: firstgid, for tile objects from templates
+        self._layer_data = dict()  # <data> element: Future of its GIDs, while parsing
 
         # only used tiles are actually loaded, so there will be a difference
         # between the GIDs in the Tiled map data (tmx) and the data in this
@@ -532,7 +833,9 @@ class TiledMap(TiledElement):
         self.maxgid = 1
 
         # should be filled in by a loader function
-        self.images = list()
+        self.images = TiledImages()
+        self._tileset_loaders = dict()  # firstgid: image loader, kept for extend_images
+        self.image_sources = list()  # image files the images are loaded from (see reload_images)
 
         # defaults from the TMX specification
         self.version = "0.0"
@@ -544,6 +847,7 @@ class TiledMap(TiledElement):
         self.tilewidth = 0  # width of a tile in pixels
         self.tileheight = 0  # height of a tile in pixels
         self.hexsidelength = 0
+        self.infinite = False
         self.staggeraxis = None
         self.staggerindex = None
         self.background_color = None
@@ -557,8 +861,10 @@ class TiledMap(TiledElement):
         if custom_property_filename:
             self.parse_json(json.load(open(custom_property_filename)))
 
-        if filename:
-            self.parse_xml(ElementTree.parse(self.filename).getroot())
+        # AT 18/10/2026 - a deferred map is loaded by the caller, a step at a time
+        if filename and not self.deferred:
+            for _ in self.iterload():
+                pass
 
     def __repr__(self):
         return '<{0}: "{1}">'.format(self.__class__.__name__, self.filename)
@@ -599,6 +905,10 @@ class TiledMap(TiledElement):
         self._set_properties(node)
         self.background_color = node.get("backgroundcolor", self.background_color)
 
+        # AT 18/10/2026 - start decompressing every layer up front, the layers below pick the results up in order
+        for subnode in node.findall(".//layer/data"):
+            self.unpack_layer_data_async(subnode)
+
         # ***         do not change this load order!         *** #
         # ***    gid mapping errors will occur if changed    *** #
         for subnode in node.findall(".//group"):
@@ -611,16 +921,296 @@ class TiledMap(TiledElement):
             self.add_layer(TiledImageLayer(self, subnode))
 
         # this will only find objectgroup layers, not including tile colliders
+        self._index_tileset_sources(node.findall(".//tileset"))
         for subnode in node.findall(".//objectgroup"):
-            objectgroup = TiledObjectGroup(self, subnode, self.custom_types)
-            self.add_layer(objectgroup)
-            for obj in objectgroup:
-                self.objects_by_id[obj.id] = obj
-                self.objects_by_name[obj.name] = obj
+            self.add_object_group(TiledObjectGroup(self, subnode, self.custom_types))
 
         for subnode in node.findall(".//tileset"):
             self.add_tileset(TiledTileset(self, subnode))
 
+        self._finish_parse()
+        return self
+
+    def iterload(self) -> Iterable[str]:
+        """Load the map file, one step at a time.
+
+        The constructor runs this to the end, unless the map was made with
+        deferred=True to let the caller spread the load over several frames.
+        Only a streamed parse (stream=True) takes more than one step, it
+        yields for every element iterparse_xml finishes with.
+
+        Yields:
+            str: what was just loaded.
+
+        """
+        # AT 18/10/2026 - restore the parsed map from the compiled cache when nothing it was built from changed
+        with load_span("cache load"):
+            cached = self.use_cache and load_map_cache(self)
+        if cached:
+            yield "cache"
+            if self.load_images:
+                self.reload_images()
+        elif is_json_file(self.filename):
+            # AT 18/10/2026 - json maps (.tmj) are converted to the element tree a tmx parses to
+            with load_span("json parse"):
+                self.parse_xml(load_json_map(self.filename))
+        elif self.stream:
+            with load_span("xml parse"):
+                for tag in self.iterparse_xml(self.filename):
+                    yield tag
+        else:
+            with load_span("xml parse"):
+                self.parse_xml(ElementTree.parse(self.filename).getroot())
+        yield "map"
+
+    def parse_xml_stream(self, source) -> TiledMap:
+        """Parse a map from a file in a single streaming pass.
+
+        Args:
+            source: Filename or file object of the map.
+
+        Returns:
+            TiledMap: self.
+
+        """
+        for _ in self.iterparse_xml(source):
+            pass
+        return self
+
+    def iterparse_xml(self, source) -> Iterable[str]:
+        """Parse a map from a file in a single pass with ElementTree.iterparse.
+
+        Unlike parse_xml, the whole document is never held in memory: each
+        tile layer is decoded as soon as its element is complete and the
+        element (with its layer data text) is then thrown away.
+
+        The load order documented in parse_xml still applies.  Tile layers
+        register their GIDs as they stream past, in document order, which is
+        the same order parse_xml registers them in.  Image layers, object
+        groups and tilesets are small, so their elements are detached and
+        built once the pass is done, in the parse_xml order.  Layers are
+        added to the map in the same order as parse_xml adds them.
+
+        Compressed layer data is decompressed on the decode thread pool as
+        soon as its <data> element is complete.  While a layer is still being
+        decoded, the layers after it wait (in order) instead of being built,
+        so the pool can work on several of them at once.
+
+        This is a generator, it yields the tag of every element it finishes
+        with so the caller can spread the parse over several frames.
+
+        Args:
+            source: Filename or file object of the map.
+
+        Yields:
+            str: tag of the element just handled.
+
+        """
+        groups = list()
+        tile_layers = list()
+        waiting = deque()  # tile layer elements not built yet, in document order
+        image_layers = list()
+        object_groups = list()
+        tilesets = list()
+
+        root = None
+        stack = list()  # open elements, with the index of their group slot
+        tileset_depth = 0  # > 0 while inside a tileset (tile colliders are not map layers)
+
+        def build_tile_layers(block):
+            # gids must be registered in document order, so only ever build from the front
+            while waiting and (block or self.layer_data_ready(waiting[0].find("data"))):
+                elem = waiting.popleft()
+                tile_layers.append(TiledTileLayer(self, elem))
+                elem.clear()
+
+        for event, elem in ElementTree.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                if tileset_depth or elem.tag == "tileset":
+                    tileset_depth += 1
+                # groups are added in document (pre)order like findall, so reserve
+                # the slot when the group opens; it is filled when the group closes
+                slot = None
+                if elem.tag == "group" and not tileset_depth:
+                    slot = len(groups)
+                    groups.append(None)
+                stack.append((elem, slot))
+                continue
+
+            _, slot = stack.pop()
+            if elem is root:
+                continue
+            parent = stack[-1][0]
+            tag = elem.tag
+
+            if tileset_depth:
+                tileset_depth -= 1
+                if tileset_depth == 0:
+                    parent.remove(elem)
+                    tilesets.append(elem)
+                continue
+
+            if tag == "data":
+                if parent.tag == "layer" and self.unpack_layer_data_async(elem):
+                    elem.text = None  # the decode job holds the text
+                continue
+            elif tag == "group":
+                groups[slot] = TiledGroupLayer(self, elem)
+                parent.remove(elem)
+            elif tag == "layer":
+                parent.remove(elem)
+                waiting.append(elem)
+                build_tile_layers(False)
+            elif tag == "imagelayer":
+                parent.remove(elem)
+                image_layers.append(elem)
+            elif tag == "objectgroup":
+                parent.remove(elem)
+                object_groups.append(elem)
+            else:
+                continue
+            yield tag
+
+        build_tile_layers(True)
+
+        # only the map's own attributes and properties are left on the root
+        self._set_properties(root)
+        self.background_color = root.get("backgroundcolor", self.background_color)
+
+        # ***         do not change this load order!         *** #
+        # ***    gid mapping errors will occur if changed    *** #
+        for layer in chain(groups, tile_layers):
+            self.add_layer(layer)
+
+        for elem in image_layers:
+            self.add_layer(TiledImageLayer(self, elem))
+            yield elem.tag
+
+        self._index_tileset_sources(tilesets)
+        for elem in object_groups:
+            self.add_object_group(TiledObjectGroup(self, elem, self.custom_types))
+            yield elem.tag
+
+        for elem in tilesets:
+            self.add_tileset(TiledTileset(self, elem))
+            yield elem.tag
+
+        self._finish_parse()
+
+    def unpack_layer_data_async(self, node: ElementTree.Element) -> bool:
+        """Start decoding the <data> of a tile layer on the decode thread pool.
+
+        The GIDs are collected by TiledTileLayer.parse_xml, through
+        unpack_layer_data.  Uncompressed data and chunks are left alone.
+
+        Args:
+            node (ElementTree.Element): <data> element of a tile layer.
+
+        Returns:
+            bool: True if decoding was started.
+
+        """
+        if getattr(node, "gids", None) is not None or node.find("chunk") is not None:
+            return False
+        future = unpack_gids_async(
+            node.text.strip(), node.get("encoding", None), node.get("compression", None)
+        )
+        if future is None:
+            return False
+        self._layer_data[node] = future
+        return True
+
+    def layer_data_ready(self, node: ElementTree.Element) -> bool:
+        """Return False while the <data> of a tile layer is still being decoded."""
+        future = self._layer_data.get(node)
+        return future is None or future.done()
+
+    def unpack_layer_data(self, node: ElementTree.Element) -> Sequence[int]:
+        """Return the raw GIDs of the <data> of a (non chunked) tile layer.
+
+        Args:
+            node (ElementTree.Element): <data> element of a tile layer.
+
+        Returns:
+            Sequence[int]: Raw (Tiled) GIDs, as returned by unpack_gids.
+
+        """
+        # json layers arrive as integer arrays already, no decoding needed
+        gids = getattr(node, "gids", None)
+        if gids is not None:
+            return gids
+        future = self._layer_data.pop(node, None)
+        if future is not None:
+            return future.result()
+        return unpack_gids(
+            text=node.text.strip(),
+            encoding=node.get("encoding", None),
+            compression=node.get("compression", None),
+        )
+
+    def _index_tileset_sources(self, tileset_nodes: Iterable[ElementTree.Element]) -> None:
+        """Record the firstgid of each external tileset, before objects are parsed."""
+        dirname = os.path.dirname(self.filename) if self.filename else ""
+        for node in tileset_nodes:
+            source = node.get("source")
+            if source:
+                path = os.path.abspath(os.path.join(dirname, source))
+                self._tileset_sources[path] = int(node.get("firstgid"))
+
+    def apply_template(self, node: ElementTree.Element) -> ElementTree.Element:
+        """Return an object node with its template's defaults filled in.
+
+        Attributes and properties set on the object override the template's.
+        Shape children (point, ellipse, polygon, text, ...) come from the
+        object if it has any, otherwise from the template.  A tile object's
+        template gid is moved to where the template's tileset is in this map.
+
+        Args:
+            node (ElementTree.Element): <object> node with a template attribute.
+
+        Returns:
+            ElementTree.Element: A new, merged <object> node.
+
+        """
+        dirname = os.path.dirname(self.filename) if self.filename else ""
+        path = os.path.abspath(os.path.join(dirname, node.get("template")))
+        if path not in self.dependencies:
+            self.dependencies.append(path)
+        template = load_template_file(path)
+
+        merged = ElementTree.Element("object", template.object.attrib)
+        merged.attrib.update(node.attrib)
+
+        if "gid" not in node.attrib and "gid" in template.object.attrib:
+            raw_gid = int(template.object.get("gid"))
+            firstgid = self._tileset_sources.get(template.tileset_source)
+            if firstgid is None:
+                raise Exception(
+                    "Template {0} uses a tileset that is not in map {1}".format(
+                        path, self.filename
+                    )
+                )
+            tiled_gid = (raw_gid & ~GID_MASK) - template.firstgid + firstgid
+            merged.set("gid", str(tiled_gid | (raw_gid & GID_MASK)))
+
+        properties = OrderedDict()
+        for source in (template.object, node):
+            for child in source.findall("properties"):
+                for prop in child.findall("property"):
+                    properties[prop.get("name")] = prop
+        if properties:
+            ElementTree.SubElement(merged, "properties").extend(properties.values())
+
+        shapes = [child for child in node if child.tag != "properties"]
+        if not shapes:
+            shapes = [child for child in template.object if child.tag != "properties"]
+        merged.extend(shapes)
+        return merged
+
+    def _finish_parse(self) -> None:
+        """Final steps of parsing a map, once every layer and tileset is loaded."""
         # "tile objects", objects with a GID, require their attributes to be
         # set after the tileset is loaded, so this step must be performed last
         # also, this step is performed for objects to load their tiles.
@@ -642,9 +1232,19 @@ class TiledMap(TiledElement):
             if self.invert_y:
                 o.y -= o.height
 
-        self.reload_images()
-        return self
+        if self.object_records:
+            self.convert_object_records()
 
+        # the cache must be written before reload_images registers any extra gids
+        if self.use_cache and self.filename:
+            with load_span("cache save"):
+                save_map_cache(self)
+
+        # AT 18/10/2026 - images are loaded by the caller when the map is loaded on another thread
+        if self.load_images:
+            self.reload_images()
+
+    @load_phase("reload_images")
     def reload_images(self) -> None:
         """Load or reload the map images from disk.
 
@@ -652,8 +1252,15 @@ class TiledMap(TiledElement):
         to do the loading or will use a generic default, in which case no
         images will be loaded.
 
+        Tile images are only loaded the first time they are read from
+        self.images, unless the map was created with preload_images.
+
         """
-        self.images = [None] * self.maxgid
+        # AT 18/10/2026 - images are LazyImage slots, so only tiles that are used get sliced and converted
+        self.images = TiledImages([None] * self.maxgid)
+        self._tileset_loaders = dict()
+        # AT 18/10/2026 - image files the map's images are loaded from, so what is baked from them can be keyed on them
+        self.image_sources = list()
 
         # iterate through tilesets to get source images
         for ts in self.tilesets:
@@ -673,7 +1280,9 @@ class TiledMap(TiledElement):
             #return os.path.join(base_path, relative_path)
 
             colorkey = getattr(ts, "trans", None)
+            self.image_sources.append(path)
             loader = self.image_loader(path, colorkey, tileset=ts)
+            self._tileset_loaders[ts.firstgid] = loader
 
             p = product(
                 range(
@@ -704,7 +1313,7 @@ class TiledMap(TiledElement):
                     # flags might rotate/flip the image, so let the loader
                     # handle that here
                     for gid, flags in gids:
-                        self.images[gid] = loader(rect, flags)
+                        self.images[gid] = LazyImage(loader, rect, flags)
                 # else:
                 #     # not used in layer data give another chance to load the tile anyway
                 #     if self.load_all_tiles or real_gid in self.optional_gids:
@@ -720,9 +1329,8 @@ class TiledMap(TiledElement):
                 gid = self.register_gid(real_gid)
                 layer.gid = gid
                 path = os.path.join(os.path.dirname(self.filename), source)
-                loader = self.image_loader(path, colorkey)
-                image = loader()
-                self.images.append(image)
+                self.image_sources.append(path)
+                self.images.append(LazyImage(load_image_file, self.image_loader, path, colorkey))
 
         # load images in tiles.
         # instead of making a new gid, replace the reference to the tile that
@@ -732,9 +1340,53 @@ class TiledMap(TiledElement):
             if source:
                 colorkey = props.get("trans", None)
                 path = os.path.join(os.path.dirname(self.filename), source)
-                loader = self.image_loader(path, colorkey)
-                image = loader()
-                self.images[real_gid] = image
+                self.image_sources.append(path)
+                self.images[real_gid] = LazyImage(load_image_file, self.image_loader, path, colorkey)
+
+        if self.preload_images:
+            self.images.preload()
+
+    def extend_images(self) -> None:
+        """Load the images of GIDs registered after reload_images.
+
+        Chunks of infinite maps are decoded (and their GIDs registered) on
+        demand, after the images were loaded; this adds slots for what they
+        registered.
+
+        """
+        for gid in range(len(self.images), self.maxgid):
+            tiled_gid = self.tiledgidmap[gid]
+            flags = next(f for g, f in self.gidmap[tiled_gid] if g == gid)
+            tileset = self.get_tileset_from_gid(gid)
+            loader = self._tileset_loaders.get(tileset.firstgid)
+            image = None
+            if loader:
+                image = LazyImage(loader, tileset.get_tile_rect(tiled_gid - tileset.firstgid), flags)
+            self.images.append(image)
+
+    def get_tile_bounds(self) -> Tuple[int, int, int, int]:
+        """Return the area covered by the tile layers, in tiles.
+
+        For finite maps this is just the map size.  Infinite maps can extend
+        into negative coordinates.
+
+        Returns:
+            Tuple[int, int, int, int]: x, y, width, height.
+
+        """
+        if not self.infinite:
+            return 0, 0, self.width, self.height
+
+        bounds = [
+            l.bounds for l in self.layers if isinstance(l, TiledTileLayer) and l.chunks
+        ]
+        if not bounds:
+            return 0, 0, self.width, self.height
+        left = min(b[0] for b in bounds)
+        top = min(b[1] for b in bounds)
+        right = max(b[0] + b[2] for b in bounds)
+        bottom = max(b[1] + b[3] for b in bounds)
+        return left, top, right - left, bottom - top
 
     def get_tile_image(self, x: int, y: int, layer: int):
         """Return the tile image for this location.
@@ -765,7 +1417,8 @@ class TiledMap(TiledElement):
         assert isinstance(layer, TiledTileLayer)
 
         try:
-            gid = layer.data[y][x]
+            # AT 18/10/2026 - through get_gid, so tiles of infinite layers are found in their chunks
+            gid = layer.get_gid(x, y)
         except (IndexError, ValueError):
             raise ValueError("GID not found")
         except TypeError:
@@ -825,7 +1478,8 @@ class TiledMap(TiledElement):
             )
 
         try:
-            return self.layers[int(layer)].data[int(y)][int(x)]
+            # AT 18/10/2026 - through get_gid, so tiles of infinite layers are found in their chunks
+            return self.layers[int(layer)].get_gid(int(x), int(y))
         except (IndexError, ValueError):
             msg = "Coords: ({0},{1}) in layer {2} is invalid"
             logger.debug(msg.format(x, y, layer))
@@ -855,12 +1509,12 @@ class TiledMap(TiledElement):
 
         try:
             # AT 2/11/2023 - self.layers was being used as if dict (is list), accessed layer by index rather than
-            # by desired id. Now accesses by layer id by looping through
-            for l in self.layers:
-                if l.id == int(layer):
-                    gid = l.data[int(y)][int(x)]
+            # by desired id. Now accesses by layer id
+            # AT 18/10/2026 - through the layers_by_id index kept by add_layer, rather than looping through layers,
+            # and get_gid, so tiles of infinite layers are found in their chunks
+            gid = self.layers_by_id[int(layer)].get_gid(int(x), int(y))
             # gid = self.layers[int(layer)].data[int(y)][int(x)]
-        except (IndexError, ValueError):
+        except (IndexError, ValueError, KeyError):
             msg = "Coords: ({0},{1}) in layer {2} is invalid."
             logger.debug(msg.format(x, y, layer))
             raise Exception(msg.format(x, y, layer))
@@ -878,7 +1532,8 @@ class TiledMap(TiledElement):
     def get_tile_locations_by_gid(self, gid: int) -> Iterable[MapPoint]:
         """Search map for tile locations by the GID.
 
-        Note: Not a fast operation.  Cache results if used often.
+        Uses the layers' GID indexes (see TiledTileLayer.get_gid_index), so
+        only the first search of a layer scans it.
 
         Args:
             gid (int): GID to be searched for.
@@ -888,7 +1543,7 @@ class TiledMap(TiledElement):
 
         """
         for l in self.visible_tile_layers:
-            for x, y, _gid in [i for i in self.layers[l].iter_data() if i[2] == gid]:
+            for x, y in self.layers[l].get_tile_locations(gid):
                 yield x, y, l
 
     def get_tile_properties_by_gid(self, gid: int) -> Optional[Dict]:
@@ -934,8 +1589,7 @@ class TiledMap(TiledElement):
             logger.debug(msg.format(type(layer)))
             raise ValueError
 
-        p = product(range(self.width), range(self.height))
-        layergids = set(self.layers[layer].data[y][x] for x, y in p)
+        layergids = set(self.layers[layer].gids)
 
         for gid in layergids:
             try:
@@ -961,12 +1615,106 @@ class TiledMap(TiledElement):
 
         self.layers.append(layer)
         self.layernames[layer.name] = layer
+        # layers from maps older than Tiled 1.2 have no id, lookups by id just miss them
+        layer_id = getattr(layer, "id", None)
+        if layer_id is not None:
+            self.layers_by_id[layer_id] = layer
+
+    def get_layer_tile_properties(self, layer: int) -> Dict[Tuple[int, int], Dict]:
+        """Return the properties of every tile in a layer that has any.
+
+        One call instead of get_tile_properties for each tile of the layer.
+
+        Args:
+            layer (int): The layer id.
+
+        Returns:
+            Dict[Tuple[int, int], dict]: Properties by (x, y), tiles without properties are left out.
+
+        Raises:
+            ValueError: If there is no tile layer with that id.
+
+        """
+        layer_ = self.layers_by_id.get(layer)
+        if not isinstance(layer_, TiledTileLayer):
+            msg = "Tile layer {0} not found."
+            logger.debug(msg.format(layer))
+            raise ValueError(msg.format(layer))
+
+        props = self.tile_properties
+        if layer_.chunks:
+            return {(x, y): props[gid] for x, y, gid in layer_.iter_data() if gid in props}
+
+        width = layer_.width
+        return {
+            (i % width, i // width): props[gid]
+            for i, gid in enumerate(layer_.gids)
+            if gid in props
+        }
+
+    def convert_object_records(self) -> None:
+        """Replace the objects that have a class with slotted records.
+
+        Objects that can't be represented by a record (see
+        TiledObject.as_record) are left as they are.
+
+        """
+        for group in self.objectgroups:
+            for i, obj in enumerate(group):
+                if not isinstance(obj, TiledObject):
+                    continue
+                record = obj.as_record()
+                if record is None:
+                    continue
+                group[i] = record
+                if self.objects_by_id.get(obj.id) is obj:
+                    self.objects_by_id[obj.id] = record
+                if self.objects_by_name.get(obj.name) is obj:
+                    self.objects_by_name[obj.name] = record
+
+    def get_layer_by_id(self, layer_id: int):
+        """Return a layer by its Tiled id.
+
+        Args:
+            layer_id (int): The layer's id.
+
+        Returns:
+            Union[TiledTileLayer, TiledImageLayer, TiledGroupLayer, TiledObjectGroup]: The layer.
+
+        Raises:
+            ValueError: if layer by id does not exist
+
+        """
+        try:
+            return self.layers_by_id[layer_id]
+        except KeyError:
+            msg = "Layer {0} not found."
+            logger.debug(msg.format(layer_id))
+            raise ValueError(msg.format(layer_id))
+
+    def add_object_group(self, objectgroup: TiledObjectGroup) -> None:
+        """Add an object group layer to the map and index its objects.
+
+        Args:
+            objectgroup (TiledObjectGroup): The object group.
+
+        """
+        self.add_layer(objectgroup)
+        for obj in objectgroup:
+            self.objects_by_id[obj.id] = obj
+            self.objects_by_name[obj.name] = obj
 
     def add_tileset(self, tileset: TiledTileset) -> None:
         """Add a tileset to the map."""
         assert isinstance(tileset, TiledTileset)
         self.tilesets.append(tileset)
 
+        # inserted before tilesets with the same firstgid, the first one added wins lookups
+        i = bisect_left(self.tileset_firstgids, tileset.firstgid)
+        self.tileset_firstgids.insert(i, tileset.firstgid)
+        self.tilesets_by_firstgid.insert(i, tileset)
+        self._gid_tilesets.clear()
+
     def get_layer_by_name(self, name: str) -> int:
         """Return a layer by name.
 
@@ -1014,8 +1762,8 @@ class TiledMap(TiledElement):
     def get_tileset_from_gid(self, gid: int) -> TiledTileset:
         """Return tileset that owns the gid.
 
-        Note: this is a slow operation, so if you are expecting to do this
-              often, it would be worthwhile to cache the results of this.
+        Looked up by bisecting the sorted firstgids and memoized per gid, so
+        it is cheap enough to call per tile.
 
         Args:
             gid (int): GID of tile image.
@@ -1027,16 +1775,23 @@ class TiledMap(TiledElement):
             ValueError: if the tileset for gid is not found
 
         """
+        try:
+            return self._gid_tilesets[gid]
+        except KeyError:
+            pass
+
         try:
             tiled_gid = self.tiledgidmap[gid]
         except KeyError:
             raise ValueError("Tile GID not found")
 
-        for tileset in sorted(self.tilesets, key=attrgetter("firstgid"), reverse=True):
-            if tiled_gid >= tileset.firstgid:
-                return tileset
+        i = bisect_right(self.tileset_firstgids, tiled_gid)
+        if not i:
+            raise ValueError("Tileset not found")
 
-        raise ValueError("Tileset not found")
+        tileset = self.tilesets_by_firstgid[i - 1]
+        self._gid_tilesets[gid] = tileset
+        return tileset
 
     def get_tile_colliders(self) -> Iterable[Tuple[int, List[Dict]]]:
         """Return iterator of (gid, dict) pairs of tiles with colliders.
@@ -1141,6 +1896,44 @@ class TiledMap(TiledElement):
         else:
             return 0
 
+    def register_gids(self, tiled_gids: Sequence[int]) -> array:
+        """Register all the GIDs of a layer and return the layer remapped to pytmx GIDs.
+
+        Each distinct GID is registered once, in the order it first appears
+        (so the result matches registering tile by tile), and the layer is then
+        remapped in bulk through the resulting lookup table.
+
+        Args:
+            tiled_gids (Sequence[int]): GIDs as found in the TMX data, including flip flags.
+
+        Returns:
+            array: Unsigned int array of pytmx GIDs, same length as `tiled_gids`.
+
+        """
+        reg = self.register_gid
+
+        def register(raw_gid):
+            if raw_gid < GID_TRANS_ROT:
+                return reg(raw_gid)
+            return reg(*decode_gid(raw_gid))
+
+        if numpy is not None:
+            raw = numpy.asarray(tiled_gids, dtype=numpy.uint32)
+            distinct, first, inverse = numpy.unique(
+                raw, return_index=True, return_inverse=True
+            )
+            table = numpy.empty(len(distinct), dtype=numpy.uint32)
+            for i in numpy.argsort(first):
+                table[i] = register(int(distinct[i]))
+            gids = array("I")
+            gids.frombytes(table[inverse.reshape(-1)].tobytes())
+            return gids
+
+        table = dict.fromkeys(tiled_gids)
+        for raw_gid in table:
+            table[raw_gid] = register(raw_gid)
+        return array("I", map(table.__getitem__, tiled_gids))
+
     def map_gid(self, tiled_gid: int) -> Optional[List[int]]:
         """Used to lookup a GID read from a TMX file's data.
 
@@ -1226,7 +2019,8 @@ class TiledTileset(TiledElement):
         # if true, then node references an external tileset
         source = node.get("source", None)
         if source:
-            if source[-4:].lower() == ".tsx":
+            # AT 18/10/2026 - json tilesets (.tsj) too
+            if source[-4:].lower() in (".tsx", ".tsj", ".json"):
 
                 # external tilesets don't save this, store it for later
                 self.firstgid = int(node.get("firstgid"))
@@ -1245,6 +2039,7 @@ class TiledTileset(TiledElement):
                     #relative_path = os.path.join(dirname, source)
                     #base_path = os.path.abspath(".")
 
+                self.parent.dependencies.append(path)
                 if not os.path.exists(path):
                     # raise OSError(errno.ENOENT, os.strerror(errno.ENOENT), path)
                     raise Exception(
@@ -1254,7 +2049,8 @@ class TiledTileset(TiledElement):
                     )
 
                 try:
-                    node = ElementTree.parse(path).getroot()
+                    # AT 18/10/2026 - tsx files are parsed once per process, not once per map that uses them
+                    node = load_tileset_file(path)
                 except IOError as io:
                     msg = "Error loading external tileset: {0}"
                     logger.error(msg.format(path))
@@ -1332,6 +2128,27 @@ class TiledTileset(TiledElement):
 
         return self
 
+    def get_tile_rect(self, tile_id: int) -> Tuple[int, int, int, int]:
+        """Return the area of a tile in the tileset image.
+
+        Args:
+            tile_id (int): Local id of the tile (Tiled GID - firstgid).
+
+        Returns:
+            Tuple[int, int, int, int]: x, y, width, height.
+
+        """
+        step_x = self.tilewidth + self.spacing
+        step_y = self.tileheight + self.spacing
+        columns = len(range(self.margin, self.width + self.margin - self.tilewidth + 1, step_x))
+        row, column = divmod(tile_id, columns)
+        return (
+            self.margin + column * step_x,
+            self.margin + row * step_y,
+            self.tilewidth,
+            self.tileheight,
+        )
+
 
 class TiledGroupLayer(TiledElement):
     def __init__(self, parent, node: ElementTree.Element) -> None:
@@ -1374,8 +2191,21 @@ class TiledTileLayer(TiledElement):
     def __init__(self, parent, node) -> None:
         TiledElement.__init__(self)
         self.parent = parent
+        # AT 18/10/2026 - tiles are stored in one flat unsigned int buffer. data is a list of rows that are
+        # memoryviews into that buffer, so data[y][x] still works (read and write) without a copy
+        self.gids = array("I")
         self.data = list()
 
+        # AT 18/10/2026 - infinite maps. chunks keep their encoded data and are only decoded when asked for
+        # (see get_chunk). decoded chunks are kept in a small LRU cache
+        self.chunks = dict()  # (x, y) of chunk in tiles: TiledChunk
+        self.chunk_width = 0
+        self.chunk_height = 0
+        self._decoded_chunks = OrderedDict()
+
+        # AT 18/10/2026 - gid: indices of the tiles with that gid, built on first use (see get_gid_index)
+        self._gid_index = None
+
         # defaults from the specification
         self.name = None
         self.width = 0
@@ -1395,6 +2225,212 @@ class TiledTileLayer(TiledElement):
     def __iter__(self):
         return self.iter_data()
 
+    def __getstate__(self):
+        # row memoryviews cannot be pickled, they are rebuilt from the buffer.
+        # decoded chunks are not kept, their gids are registered again when decoded
+        state = self.__dict__.copy()
+        del state["data"]
+        state["_decoded_chunks"] = OrderedDict()
+        state["_gid_index"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.data = reshape_data(memoryview(self.gids), self.width)
+
+    @property
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """Area covered by the layer in tiles: x, y, width, height.
+
+        For infinite layers this is the area of the chunks, nothing is decoded.
+
+        """
+        if not self.chunks:
+            return 0, 0, self.width, self.height
+        left = min(x for x, y in self.chunks)
+        top = min(y for x, y in self.chunks)
+        right = max(x + c.width for (x, y), c in self.chunks.items())
+        bottom = max(y + c.height for (x, y), c in self.chunks.items())
+        return left, top, right - left, bottom - top
+
+    def get_chunk(self, x: int, y: int) -> Optional[array]:
+        """Return the GIDs of a chunk of an infinite layer, decoding it if needed.
+
+        Args:
+            x (int): x of the chunk's top left tile.
+            y (int): y of the chunk's top left tile.
+
+        Returns:
+            Optional[array]: Row-major GIDs of the chunk, or None if there is no chunk there.
+
+        """
+        key = (x, y)
+        decoded = self._decoded_chunks
+        try:
+            decoded.move_to_end(key)
+            return decoded[key]
+        except KeyError:
+            pass
+
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            return None
+
+        gids = self.parent.register_gids(chunk.unpack())
+        if len(self.parent.images) < self.parent.maxgid:
+            self.parent.extend_images()
+
+        decoded[key] = gids
+        while len(decoded) > self.parent.chunk_cache_size:
+            decoded.popitem(last=False)
+        return gids
+
+    def chunks_in_area(self, x: int, y: int, width: int, height: int) -> List[Tuple[int, int]]:
+        """Return the chunks of an infinite layer that overlap an area, nothing is decoded.
+
+        Args:
+            x (int): x of the area in tiles.
+            y (int): y of the area in tiles.
+            width (int): width of the area in tiles.
+            height (int): height of the area in tiles.
+
+        Returns:
+            List[Tuple[int, int]]: (x, y) keys of the chunks.
+
+        """
+        if not self.chunks:
+            return []
+        cw = self.chunk_width
+        ch = self.chunk_height
+        keys = product(
+            range(y - y % ch, y + height, ch),
+            range(x - x % cw, x + width, cw),
+        )
+        return [(kx, ky) for ky, kx in keys if (kx, ky) in self.chunks]
+
+    def iter_chunk_data(self, x: int, y: int) -> Iterable[Tuple[int, int, int]]:
+        """Yields X, Y, GID tuples for each tile of a chunk, X and Y in map tiles.
+
+        Args:
+            x (int): x of the chunk's top left tile.
+            y (int): y of the chunk's top left tile.
+
+        """
+        gids = self.get_chunk(x, y)
+        if gids is None:
+            return
+        width = self.chunks[(x, y)].width
+        for i, gid in enumerate(gids):
+            row, column = divmod(i, width)
+            yield x + column, y + row, gid
+
+    def get_gid(self, x: int, y: int) -> int:
+        """Return the GID of one tile, decoding its chunk if the layer is infinite.
+
+        Args:
+            x (int): The x coordinate.
+            y (int): The y coordinate.
+
+        Returns:
+            int: The GID, 0 for tiles of an infinite layer that no chunk covers.
+
+        Raises:
+            IndexError: If the coordinates are outside a finite layer.
+
+        """
+        if not self.chunks:
+            return self.data[y][x]
+        key = (x - x % self.chunk_width, y - y % self.chunk_height)
+        gids = self.get_chunk(*key)
+        if gids is None:
+            return 0
+        return gids[(y - key[1]) * self.chunks[key].width + x - key[0]]
+
+    @property
+    def view(self) -> memoryview:
+        """2D (height, width) memoryview of the layer's GIDs, indexed view[y, x].
+
+        Shares memory with the layer, nothing is copied.
+
+        """
+        return memoryview(self.gids).cast("B").cast("I", (self.height, self.width))
+
+    def as_numpy(self):
+        """Return the layer's GIDs as a (height, width) numpy array sharing the layer's memory.
+
+        Raises:
+            ImportError: if numpy is not installed.
+
+        """
+        if numpy is None:
+            raise ImportError("numpy is required for TiledTileLayer.as_numpy")
+        return numpy.frombuffer(self.gids, dtype=numpy.uint32).reshape(
+            self.height, self.width
+        )
+
+    def get_gid_index(self) -> Dict[int, array]:
+        """Return the layer's inverted index, GID -> flat tile indices (y * width + x).
+
+        Built the first time it is asked for and kept up to date by
+        set_tile_gid.  Not available for infinite layers.
+
+        Returns:
+            Dict[int, array]: see index_gids.
+
+        """
+        if self.chunks:
+            raise ValueError("infinite layers are not indexed, use iter_data")
+        if self._gid_index is None:
+            self._gid_index = index_gids(self.gids)
+        return self._gid_index
+
+    def get_tile_locations(self, gid: int) -> List[Tuple[int, int]]:
+        """Return the X, Y of every tile in the layer with this GID.
+
+        Args:
+            gid (int): GID to find.
+
+        Returns:
+            List[Tuple[int, int]]: Locations, in row-major order for unedited layers.
+
+        """
+        if self.chunks:
+            return [(x, y) for x, y, _gid in self.iter_data() if _gid == gid]
+        width = self.width
+        return [(i % width, i // width) for i in self.get_gid_index().get(gid, ())]
+
+    def set_tile_gid(self, x: int, y: int, gid: int) -> None:
+        """Set the GID of a tile, keeping the GID index up to date.
+
+        Writing to data or gids directly works too, but leaves the index stale.
+
+        Args:
+            x (int): The x coordinate.
+            y (int): The y coordinate.
+            gid (int): The pytmx GID (see TiledMap.register_gid), 0 to clear the tile.
+
+        Raises:
+            ValueError: If coordinates are out of bounds, or the layer is infinite.
+
+        """
+        if self.chunks:
+            raise ValueError("tiles of infinite layers cannot be set")
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError("Coords: ({0},{1}) are outside the layer".format(x, y))
+
+        i = y * self.width + x
+        old = self.gids[i]
+        self.gids[i] = gid
+        index = self._gid_index
+        if index is None or old == gid:
+            return
+        if old:
+            index[old].remove(i)
+            if not index[old]:
+                del index[old]
+        if gid:
+            index.setdefault(gid, array("I")).append(i)
+
     def iter_data(self) -> Iterable[Tuple[int, int, int]]:
         """Yields X, Y, GID tuples for each tile in the layer.
 
@@ -1402,6 +2438,12 @@ class TiledTileLayer(TiledElement):
             Iterable[Tuple[int, int, int]]: Iterator of X, Y, GID tuples for each tile in the layer.
 
         """
+        if self.chunks:
+            # every chunk is decoded, use chunks_in_area/iter_chunk_data to only touch part of the layer
+            for x, y in sorted(self.chunks, key=lambda k: (k[1], k[0])):
+                yield from self.iter_chunk_data(x, y)
+            return
+
         for y, row in enumerate(self.data):
             for x, gid in enumerate(row):
                 yield x, y, gid
@@ -1414,8 +2456,17 @@ class TiledTileLayer(TiledElement):
 
         """
         images = self.parent.images
-        for x, y, gid in [i for i in self.iter_data() if i[2]]:
-            yield x, y, images[gid]
+        if self.chunks:
+            for x, y, gid in self.iter_data():
+                if gid:
+                    yield x, y, images[gid]
+            return
+
+        width = self.width
+        for i, gid in enumerate(self.gids):
+            if gid:
+                y, x = divmod(i, width)
+                yield x, y, images[gid]
 
     def _set_properties(self, node) -> None:
         TiledElement._set_properties(self, node)
@@ -1440,9 +2491,15 @@ class TiledTileLayer(TiledElement):
         data_node = node.find("data")
         chunk_nodes = data_node.findall("chunk")
         if chunk_nodes:
-            msg = "TMX map size: infinite is not supported."
-            logger.error(msg)
-            raise Exception
+            encoding = data_node.get("encoding", None)
+            compression = data_node.get("compression", None)
+            for chunk_node in chunk_nodes:
+                chunk = TiledChunk(chunk_node, encoding, compression)
+                self.chunks[(chunk.x, chunk.y)] = chunk
+            # tiled writes every chunk of a map at the same size
+            self.chunk_width = chunk.width
+            self.chunk_height = chunk.height
+            return self
 
         child = data_node.find("tile")
         if child is not None:
@@ -1450,28 +2507,39 @@ class TiledTileLayer(TiledElement):
                 "XML tile elements are no longer supported. Must use base64 or csv map formats."
             )
 
-        reg = self.parent.register_gid
-        temp = list()
-        temp_append = temp.append
-        for gid in unpack_gids(
-            text=data_node.text.strip(),
-            encoding=data_node.get("encoding", None),
-            compression=data_node.get("compression", None),
-        ):
-            if gid == 0:
-                temp_append(0)
-            elif gid < GID_TRANS_ROT:
-                gid = reg(gid)
-                temp_append(gid)
-            else:
-                gid, flags = decode_gid(gid)
-                gid = reg(gid, flags)
-                temp_append(gid)
-
-        self.data = reshape_data(temp, self.width)
+        # AT 18/10/2026 - the map decodes the data, possibly already done on its thread pool
+        self.gids = self.parent.register_gids(self.parent.unpack_layer_data(data_node))
+        self.data = reshape_data(memoryview(self.gids), self.width)
         return self
 
 
+class TiledChunk:
+    """Encoded data of one chunk of an infinite tile layer.
+
+    The data is only unpacked when the layer decodes the chunk.  Chunks of
+    json maps hold their GIDs as an array already (in ``text``).
+
+    """
+
+    __slots__ = ("x", "y", "width", "height", "text", "encoding", "compression")
+
+    def __init__(self, node: ElementTree.Element, encoding, compression) -> None:
+        self.x = int(node.get("x"))
+        self.y = int(node.get("y"))
+        self.width = int(node.get("width"))
+        self.height = int(node.get("height"))
+        gids = getattr(node, "gids", None)
+        self.text = node.text.strip() if gids is None else gids
+        self.encoding = encoding
+        self.compression = compression
+
+    def unpack(self) -> array:
+        """Return the raw (Tiled) GIDs of the chunk."""
+        if not isinstance(self.text, str):
+            return self.text
+        return unpack_gids(self.text, self.encoding, self.compression)
+
+
 class TiledObjectGroup(TiledElement, list):
     """Represents a Tiled ObjectGroup
 
@@ -1574,6 +2642,10 @@ class TiledObject(TiledElement):
             """
             return tuple(tuple(map(float, i.split(","))) for i in text.split())
 
+        # AT 18/10/2026 - objects made from a template only store what differs from it, the rest comes from the .tx
+        if node.get("template"):
+            node = self.parent.apply_template(node)
+
         self._set_properties(node, self.custom_types)
 
         # correctly handle "tile objects" (object with gid set)
@@ -1630,6 +2702,135 @@ class TiledObject(TiledElement):
         ]
 
 
+    def as_record(self) -> Optional["TiledObjectRecord"]:
+        """Return a slotted record holding this object, if it can be one.
+
+        Only objects with a class, no points and properties whose names are
+        usable as attributes are converted.
+
+        Returns:
+            Optional[TiledObjectRecord]: The record, or None.
+
+        """
+        if not (self.type and self.type.isidentifier()) or hasattr(self, "points"):
+            return None
+        if not _record_object_attributes.issuperset(self.__dict__):
+            return None
+        fields = tuple(self.properties)
+        for field in fields:
+            if (
+                not field.isidentifier()
+                or keyword.iskeyword(field)
+                or field in TiledObjectRecord.__slots__
+                or field in _record_reserved
+            ):
+                return None
+
+        cls = object_record_class(self.type, fields, self.properties)
+        record = cls.__new__(cls)
+        for name in TiledObjectRecord.__slots__:
+            setattr(record, name, getattr(self, name))
+        for name in fields:
+            setattr(record, name, self.properties[name])
+        return record
+
+
+class TiledObjectRecord:
+    """Compact stand-in for a TiledObject that has a Tiled class.
+
+    A slotted subclass is generated per class and set of property names (see
+    object_record_class), properties are plain attributes of it.  Attribute
+    access skips TiledElement.__getattr__ and instances have no __dict__,
+    which adds up for maps with many objects.
+
+    Records are read like objects, but are not TiledObject instances.
+    `properties` is a read-only view built on access, writing to it raises
+    TypeError (set the attribute instead).
+
+    """
+
+    __slots__ = (
+        "parent",
+        "id",
+        "name",
+        "type",
+        "x",
+        "y",
+        "width",
+        "height",
+        "rotation",
+        "gid",
+        "visible",
+        "template",
+    )
+    fields = ()  # property names, set on generated classes
+
+    image = TiledObject.image
+    as_points = TiledObject.as_points
+    apply_transformations = TiledObject.apply_transformations
+
+    @property
+    def properties(self) -> MappingProxyType:
+        return MappingProxyType({name: getattr(self, name) for name in self.fields})
+
+    def __reduce__(self):
+        # generated classes can't be pickled by reference, they are generated again on load
+        slots = TiledObjectRecord.__slots__ + self.fields
+        return _restore_object_record, (
+            self.type,
+            self.fields,
+            tuple(getattr(self, name) for name in slots),
+        )
+
+    def __repr__(self):
+        return '<{}[{}]: "{}">'.format(self.__class__.__name__, self.id, self.name)
+
+
+# attributes a TiledObject may have and still be converted to a record
+_record_object_attributes = set(TiledObjectRecord.__slots__) | {
+    "properties",
+    "custom_types",
+    "closed",
+}
+# names used by the record classes themselves
+_record_reserved = {"fields", "properties", "image", "as_points", "apply_transformations"}
+
+# generated record classes: {(class name, property names): class}
+_object_record_classes = dict()
+
+
+def object_record_class(type_name: str, fields: Tuple[str, ...], example: Dict = None) -> type:
+    """Return the record class for a Tiled class with these property names.
+
+    Args:
+        type_name (str): Name of the Tiled class (TiledObject.type).
+        fields (Tuple[str, ...]): Property names.
+        example (Dict): Properties of an object of the class, used to annotate field types.
+
+    Returns:
+        type: A TiledObjectRecord subclass.
+
+    """
+    key = type_name, fields
+    cls = _object_record_classes.get(key)
+    if cls is None:
+        namespace = {"__slots__": fields, "fields": fields}
+        if example:
+            namespace["__annotations__"] = {name: type(example[name]) for name in fields}
+        cls = type(type_name, (TiledObjectRecord,), namespace)
+        _object_record_classes[key] = cls
+    return cls
+
+
+def _restore_object_record(type_name: str, fields: Tuple[str, ...], values: tuple):
+    example = dict(zip(fields, values[len(TiledObjectRecord.__slots__):]))
+    cls = object_record_class(type_name, fields, example)
+    record = cls.__new__(cls)
+    for name, value in zip(TiledObjectRecord.__slots__ + fields, values):
+        setattr(record, name, value)
+    return record
+
+
 class TiledImageLayer(TiledElement):
     """Represents Tiled Image Layer.
 
@@ -0,0 +1,321 @@
+"""
+Load telemetry for pytmx.
+
+Loading a map goes through several phases: xml parse, tsx parse, image
+loading and tile conversion, and then whatever the game builds from the map.
+A phase wrapped in load_span (or a function decorated with load_phase) is
+timed and recorded in the LoadReport active on the current thread.
+
+A report is opened with start_report and closed with finish_report.  For
+every span it holds the inclusive wall time, the number of calls, and the
+surfaces created and bytes allocated while it was open.  Spans with the same
+name under the same parent are merged, so per-tile phases show up once with a
+call count.
+
+Surfaces are counted when they are passed to add_surface.  The surface bytes
+are the pixel data of those surfaces.  Python heap bytes are only recorded
+while tracemalloc is tracing.
+
+A load spread over several frames suspends its report between them
+(suspend_report / resume_report).  Time spent suspended is left out of the
+report and of any span that was open at the time.
+
+With no active report, a span only costs a thread-local lookup.
+
+"""
+import functools
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "LoadReport",
+    "LoadSpan",
+    "active_report",
+    "add_surface",
+    "finish_report",
+    "load_phase",
+    "load_span",
+    "resume_report",
+    "start_report",
+    "suspend_report",
+]
+
+_local = threading.local()
+
+
+class LoadSpan:
+    """Totals of one phase of a load (all calls with the same path)."""
+
+    __slots__ = ("path", "calls", "seconds", "surfaces", "surface_bytes", "py_bytes")
+
+    def __init__(self, path: tuple) -> None:
+        self.path = path
+        self.calls = 0
+        self.seconds = 0.0
+        self.surfaces = 0
+        self.surface_bytes = 0
+        self.py_bytes = None
+
+    @property
+    def name(self) -> str:
+        return self.path[-1]
+
+    def as_dict(self) -> Dict:
+        return {
+            "path": "/".join(self.path),
+            "calls": self.calls,
+            "ms": round(self.seconds * 1000, 3),
+            "surfaces": self.surfaces,
+            "surface_bytes": self.surface_bytes,
+            "py_bytes": self.py_bytes,
+        }
+
+
+class LoadReport:
+    """Timings of one load, see the module docs.
+
+    Attributes:
+        name (str): what was loaded, e.g. the map file.
+        started (float): time.time() when the report was opened.
+        seconds (float): wall time from start_report to finish_report, less any time suspended.
+        slices (int): number of times the report was resumed after being suspended, plus one.
+        surfaces (int): surfaces created during the load.
+        surface_bytes (int): pixel bytes of those surfaces.
+        py_bytes (Optional[int]): net python heap growth, if tracemalloc was tracing.
+        spans (OrderedDict): {path: LoadSpan}, in the order phases were first entered.
+
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started = time.time()
+        self.seconds = 0.0
+        self.slices = 1
+        self.surfaces = 0
+        self.surface_bytes = 0
+        self.py_bytes = None
+        self.spans = OrderedDict()
+        self._path = ()
+        self._start = time.perf_counter()
+        self._start_py = _traced_bytes()
+        self._suspended = 0.0  # total seconds spent suspended
+        self._suspended_at = None
+
+    def span(self, name: str) -> "_Span":
+        """Return a context manager that records a phase of this load."""
+        return _Span(self, name)
+
+    def suspend(self) -> None:
+        self._suspended_at = time.perf_counter()
+
+    def resume(self) -> None:
+        if self._suspended_at is not None:
+            self._suspended += time.perf_counter() - self._suspended_at
+            self._suspended_at = None
+            self.slices += 1
+
+    def finish(self) -> None:
+        self.seconds = time.perf_counter() - self._start - self._suspended
+        if self._start_py is not None:
+            end_py = _traced_bytes()
+            if end_py is not None:
+                self.py_bytes = end_py - self._start_py
+
+    def as_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "time": self.started,
+            "ms": round(self.seconds * 1000, 3),
+            "slices": self.slices,
+            "surfaces": self.surfaces,
+            "surface_bytes": self.surface_bytes,
+            "py_bytes": self.py_bytes,
+            "spans": [span.as_dict() for span in self.spans.values()],
+        }
+
+    def lines(self, depth: Optional[int] = None) -> List[str]:
+        """Return the report as indented text lines, one per phase.
+
+        Args:
+            depth (Optional[int]): only include phases nested this deep or less.
+
+        """
+        lines = [
+            "{0}: {1:.1f}ms, {2} surfaces, {3}KB".format(
+                self.name, self.seconds * 1000, self.surfaces, self.surface_bytes // 1024
+            )
+        ]
+        if self.slices > 1:
+            lines[0] += ", {0} frames".format(self.slices)
+        for span in self.spans.values():
+            if depth is not None and len(span.path) > depth:
+                continue
+            line = "{0}{1}: {2:.1f}ms".format("  " * len(span.path), span.name, span.seconds * 1000)
+            if span.calls > 1:
+                line += " x{0}".format(span.calls)
+            if span.surfaces:
+                line += ", {0} surfaces, {1}KB".format(span.surfaces, span.surface_bytes // 1024)
+            if span.py_bytes is not None:
+                line += ", py {0}KB".format(span.py_bytes // 1024)
+            lines.append(line)
+        return lines
+
+    def format(self, depth: Optional[int] = None) -> str:
+        return "\n".join(self.lines(depth))
+
+    def write_json_lines(self, path: str) -> None:
+        """Append the report to a JSON lines file, one report per line."""
+        with open(path, "a") as fp:
+            fp.write(json.dumps(self.as_dict()) + "\n")
+
+
+class _Span:
+    __slots__ = ("report", "name", "parent_path", "start", "suspended", "surfaces", "surface_bytes", "py")
+
+    def __init__(self, report: LoadReport, name: str) -> None:
+        self.report = report
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        report = self.report
+        self.parent_path = report._path
+        path = report._path = self.parent_path + (self.name,)
+        # added when first entered, so parents are listed before their children
+        if path not in report.spans:
+            report.spans[path] = LoadSpan(path)
+        self.surfaces = report.surfaces
+        self.surface_bytes = report.surface_bytes
+        self.py = _traced_bytes()
+        self.suspended = report._suspended
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        report = self.report
+        seconds = time.perf_counter() - self.start - (report._suspended - self.suspended)
+        span = report.spans[report._path]
+        report._path = self.parent_path
+        span.calls += 1
+        span.seconds += seconds
+        span.surfaces += report.surfaces - self.surfaces
+        span.surface_bytes += report.surface_bytes - self.surface_bytes
+        if self.py is not None:
+            end_py = _traced_bytes()
+            if end_py is not None:
+                span.py_bytes = (span.py_bytes or 0) + end_py - self.py
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_null_span = _NullSpan()
+
+
+def _traced_bytes() -> Optional[int]:
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    return None
+
+
+def active_report() -> Optional[LoadReport]:
+    """Return the report open on this thread, or None."""
+    reports = getattr(_local, "reports", None)
+    return reports[-1] if reports else None
+
+
+def start_report(name: str) -> LoadReport:
+    """Open a report on this thread; spans are recorded into it until finish_report.
+
+    Reports nest: one opened while another is active is recorded on its own
+    and the outer report continues once it is finished.
+
+    """
+    report = LoadReport(name)
+    resume_report(report)
+    return report
+
+
+def suspend_report(report: LoadReport) -> None:
+    """Set aside the innermost report of this thread, to be continued with resume_report.
+
+    Nothing is recorded into the report while it is suspended, and the time
+    until it is resumed is not counted.
+
+    """
+    reports = getattr(_local, "reports", None)
+    if not reports or reports[-1] is not report:
+        raise ValueError("only the innermost report can be suspended")
+    reports.pop()
+    report.suspend()
+
+
+def resume_report(report: LoadReport) -> None:
+    """Make a report (new or suspended) the innermost report of this thread."""
+    report.resume()
+    reports = getattr(_local, "reports", None)
+    if reports is None:
+        reports = _local.reports = list()
+    reports.append(report)
+
+
+def finish_report() -> Optional[LoadReport]:
+    """Close the innermost report on this thread and return it (None if there was none)."""
+    reports = getattr(_local, "reports", None)
+    if not reports:
+        return None
+    report = reports.pop()
+    report.finish()
+    logger.debug("\n" + report.format())
+    return report
+
+
+def load_span(name: str):
+    """Return a context manager recording a phase into the active report.
+
+    Args:
+        name (str): name of the phase, spans nest by where they are opened.
+
+    """
+    report = active_report()
+    if report is None:
+        return _null_span
+    return _Span(report, name)
+
+
+def load_phase(name: str) -> Callable:
+    """Decorator, records every call of the function as a span."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            report = active_report()
+            if report is None:
+                return func(*args, **kwargs)
+            with _Span(report, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def add_surface(surface) -> None:
+    """Count a newly created surface (and its pixel bytes) in the active report."""
+    report = active_report()
+    if report is not None:
+        report.surfaces += 1
+        report.surface_bytes += surface.get_pitch() * surface.get_height()
@@ -0,0 +1,307 @@
+"""
+Tiled JSON (.tmj, .tsj, .tj) support for pytmx.
+
+JSON maps are read with the json module and turned into the same element
+tree a .tmx file parses to, so TiledMap.parse_xml and the Tiled* classes
+build them exactly like xml maps (templates, custom types, tile colliders
+and the map cache included).
+
+The exception is tile layer data: JSON already holds it as integers, so the
+<data>/<chunk> elements made here carry the GIDs as an array (see GidData)
+and the layer skips unpack_gids.  Base64 encoded JSON layers are passed on
+as text and unpacked as usual.
+
+"""
+import json
+import logging
+import os
+from array import array
+from xml.etree import ElementTree
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "GidData",
+    "is_json_file",
+    "load_json_map",
+    "load_json_tileset",
+    "load_json_template",
+]
+
+json_extensions = (".tmj", ".tsj", ".tj", ".json")
+
+# keys that are written as child elements (or not at all), never as attributes
+_map_children = {"layers", "tilesets", "properties", "type", "editorsettings"}
+_tileset_children = {
+    "image",
+    "imagewidth",
+    "imageheight",
+    "transparentcolor",
+    "tileoffset",
+    "tiles",
+    "properties",
+    "type",
+    "version",
+    "tiledversion",
+    "grid",
+    "wangsets",
+    "terrains",
+    "transformations",
+}
+_tile_children = {"image", "imagewidth", "imageheight", "animation", "objectgroup", "properties"}
+_layer_children = {
+    "type",
+    "properties",
+    "layers",
+    "objects",
+    "data",
+    "chunks",
+    "encoding",
+    "compression",
+    "image",
+    "transparentcolor",
+    "x",
+    "y",
+    "startx",
+    "starty",
+}
+_object_children = {"properties", "polygon", "polyline", "ellipse", "point", "text"}
+# empty strings json writes for unset values, xml leaves these out
+_omit_if_empty = {"name", "type", "class"}
+
+
+class GidData(ElementTree.Element):
+    """<data> or <chunk> element of a JSON tile layer.
+
+    `gids` holds the raw Tiled GIDs as an unsigned int array, or is None when
+    the layer is base64 encoded and the data is in `text` as usual.
+
+    """
+
+    gids = None
+
+
+def is_json_file(path: str) -> bool:
+    """Return True if the path is a Tiled JSON map, tileset or template."""
+    return os.path.splitext(path)[1].lower() in json_extensions
+
+
+def _value(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _attributes(data: dict, children) -> dict:
+    return {
+        key: _value(value)
+        for key, value in data.items()
+        if key not in children
+        and not isinstance(value, (dict, list))
+        and not (key in _omit_if_empty and value == "")
+    }
+
+
+def _property_type(value) -> str:
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    return "string"
+
+
+def _add_properties(node: ElementTree.Element, properties) -> None:
+    if not properties:
+        return
+    parent = ElementTree.SubElement(node, "properties")
+    for prop in properties:
+        kind = prop.get("type", "string")
+        attributes = {"name": prop["name"]}
+        if kind != "string":
+            attributes["type"] = kind
+        if "propertytype" in prop:
+            attributes["propertytype"] = prop["propertytype"]
+        child = ElementTree.SubElement(parent, "property", attributes)
+        if kind == "class":
+            # members of a class value are given without their types, class members are objects of their own members
+            # (parse_properties gets their custom type from the enclosing class)
+            members = [
+                {"name": name, "type": "class" if isinstance(value, dict) else _property_type(value), "value": value}
+                for name, value in prop.get("value", {}).items()
+            ]
+            _add_properties(child, members)
+        else:
+            child.set("value", _value(prop.get("value", "")))
+
+
+def _image(node: ElementTree.Element, source, width=None, height=None, trans=None) -> None:
+    attributes = {"source": source}
+    if width is not None:
+        attributes["width"] = str(width)
+    if height is not None:
+        attributes["height"] = str(height)
+    if trans:
+        attributes["trans"] = trans.lstrip("#")
+    ElementTree.SubElement(node, "image", attributes)
+
+
+def _gid_data(tag: str, attributes: dict, data, encoding) -> GidData:
+    node = GidData(tag, attributes)
+    if encoding == "base64":
+        node.text = data
+    else:
+        node.gids = array("I", data)
+    return node
+
+
+def object_element(data: dict) -> ElementTree.Element:
+    """Return the <object> element for a JSON object."""
+    node = ElementTree.Element("object", _attributes(data, _object_children))
+    _add_properties(node, data.get("properties"))
+    if data.get("ellipse"):
+        ElementTree.SubElement(node, "ellipse")
+    if data.get("point"):
+        ElementTree.SubElement(node, "point")
+    for kind in ("polygon", "polyline"):
+        if kind in data:
+            points = " ".join("{0},{1}".format(p["x"], p["y"]) for p in data[kind])
+            ElementTree.SubElement(node, kind, {"points": points})
+    if "text" in data:
+        text = data["text"]
+        child = ElementTree.SubElement(node, "text", _attributes(text, {"text"}))
+        child.text = text.get("text", "")
+    return node
+
+
+def layer_element(data: dict) -> ElementTree.Element:
+    """Return the element for a JSON layer (tile, object, image or group layer)."""
+    kind = data["type"]
+    attributes = _attributes(data, _layer_children)
+
+    if kind == "tilelayer":
+        node = ElementTree.Element("layer", attributes)
+        encoding = data.get("encoding")
+        data_attributes = dict()
+        if encoding == "base64":
+            data_attributes["encoding"] = encoding
+            if data.get("compression"):
+                data_attributes["compression"] = data["compression"]
+        if "chunks" in data:
+            data_node = GidData("data", data_attributes)
+            for chunk in data["chunks"]:
+                chunk_attributes = {k: str(chunk[k]) for k in ("x", "y", "width", "height")}
+                data_node.append(_gid_data("chunk", chunk_attributes, chunk["data"], encoding))
+        else:
+            data_node = _gid_data("data", data_attributes, data["data"], encoding)
+        node.append(data_node)
+
+    elif kind == "objectgroup":
+        node = ElementTree.Element("objectgroup", attributes)
+        for obj in data.get("objects", ()):
+            node.append(object_element(obj))
+
+    elif kind == "imagelayer":
+        node = ElementTree.Element("imagelayer", attributes)
+        if data.get("image"):
+            _image(node, data["image"], trans=data.get("transparentcolor"))
+
+    elif kind == "group":
+        node = ElementTree.Element("group", attributes)
+        for layer in data.get("layers", ()):
+            node.append(layer_element(layer))
+
+    else:
+        raise ValueError("Unknown JSON layer type {0}".format(kind))
+
+    # properties first, like tiled writes them in xml
+    properties = ElementTree.Element("properties")
+    _add_properties(properties, data.get("properties"))
+    if len(properties):
+        node.insert(0, properties[0])
+    return node
+
+
+def tileset_element(data: dict) -> ElementTree.Element:
+    """Return the <tileset> element for a JSON tileset (embedded or .tsj)."""
+    node = ElementTree.Element("tileset", _attributes(data, _tileset_children))
+    _add_properties(node, data.get("properties"))
+    if data.get("image"):
+        _image(
+            node,
+            data["image"],
+            data.get("imagewidth"),
+            data.get("imageheight"),
+            data.get("transparentcolor"),
+        )
+    if "tileoffset" in data:
+        offset = data["tileoffset"]
+        ElementTree.SubElement(node, "tileoffset", {"x": str(offset["x"]), "y": str(offset["y"])})
+
+    for tile in data.get("tiles", ()):
+        child = ElementTree.SubElement(node, "tile", _attributes(tile, _tile_children))
+        _add_properties(child, tile.get("properties"))
+        if tile.get("image"):
+            _image(child, tile["image"], tile.get("imagewidth"), tile.get("imageheight"))
+        if "animation" in tile:
+            animation = ElementTree.SubElement(child, "animation")
+            for frame in tile["animation"]:
+                ElementTree.SubElement(
+                    animation,
+                    "frame",
+                    {"tileid": str(frame["tileid"]), "duration": str(frame["duration"])},
+                )
+        if "objectgroup" in tile:
+            child.append(layer_element(tile["objectgroup"]))
+    return node
+
+
+def map_element(data: dict) -> ElementTree.Element:
+    """Return the <map> element for a JSON map."""
+    node = ElementTree.Element("map", _attributes(data, _map_children))
+    _add_properties(node, data.get("properties"))
+    for tileset in data.get("tilesets", ()):
+        if "source" in tileset:
+            attributes = {"firstgid": str(tileset["firstgid"]), "source": tileset["source"]}
+            ElementTree.SubElement(node, "tileset", attributes)
+        else:
+            node.append(tileset_element(tileset))
+    for layer in data.get("layers", ()):
+        node.append(layer_element(layer))
+    return node
+
+
+def _load(path: str) -> dict:
+    with open(path, "rb") as fp:
+        return json.load(fp)
+
+
+def load_json_map(path: str) -> ElementTree.Element:
+    """Load a .tmj file and return it as a <map> element.
+
+    Args:
+        path (str): Path of the map.
+
+    Returns:
+        ElementTree.Element: The map, as TiledMap.parse_xml expects it.
+
+    """
+    return map_element(_load(path))
+
+
+def load_json_tileset(path: str) -> ElementTree.Element:
+    """Load a .tsj file and return it as a <tileset> element."""
+    return tileset_element(_load(path))
+
+
+def load_json_template(path: str) -> ElementTree.Element:
+    """Load a .tj file and return it as a <template> element."""
+    data = _load(path)
+    node = ElementTree.Element("template")
+    if "tileset" in data:
+        tileset = data["tileset"]
+        attributes = {"firstgid": str(tileset["firstgid"]), "source": tileset["source"]}
+        ElementTree.SubElement(node, "tileset", attributes)
+    node.append(object_element(data["object"]))
+    return node
@@ -17,12 +17,14 @@ GNU Lesser General Public License for more details.
 You should have received a copy of the GNU Lesser General Public
 License along with pytmx.  If not, see <http://www.gnu.org/licenses/>.
 """
-import itertools
 import logging
-from typing import Optional, Union, List
+import os
+from collections import OrderedDict
+from typing import Optional, Union, List, Tuple
 
 import pytmx
 from pytmx.pytmx import ColorLike, PointLike
+from pytmx.telemetry import add_surface, load_phase, load_span
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +35,28 @@ except ImportError:
     logger.error("cannot import pygame (is it installed?)")
     raise
 
-__all__ = ["load_pygame", "pygame_image_loader", "simplify", "build_rects"]
+# optional, classifies whole tileset sheets at once
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = [
+    "load_pygame",
+    "pygame_image_loader",
+    "simplify",
+    "greedy_mesh",
+    "build_rects",
+    "get_transparency",
+    "TILE_OPAQUE",
+    "TILE_COLORKEY",
+    "TILE_ALPHA",
+]
+
+# how a tile handles transparency, decides the pixel format it is converted to
+TILE_OPAQUE = "opaque"  # no transparent pixels, plain convert()
+TILE_COLORKEY = "colorkey"  # contains colorkey pixels
+TILE_ALPHA = "alpha"  # contains (partly) transparent pixels
 
 
 def handle_transformation(
@@ -58,10 +81,121 @@ def handle_transformation(
     return tile
 
 
+def classify_surface(
+    original: pygame.Surface,
+    colorkey: Optional[ColorLike],
+) -> Optional[str]:
+    """
+    Return the transparency class of a single tile surface
+
+    Parameters:
+        original: tile surface to inspect
+        colorkey: optional colorkey for the tileset image
+
+    Returns:
+        TILE_OPAQUE, TILE_COLORKEY or TILE_ALPHA, None if it can't be checked
+
+    """
+    # tiled set a colorkey
+    if colorkey:
+        return TILE_COLORKEY
+
+    # no colorkey, so use a mask to determine if there are transparent pixels
+    tile_size = original.get_size()
+    threshold = 254  # the default
+
+    try:
+        # count the number of pixels in the tile that are not transparent
+        px = pygame.mask.from_surface(original, threshold).count()
+    except:
+        # pygame_sdl2 will fail because the mask module is not included
+        return None
+
+    # there are no transparent pixels in the image
+    if px == tile_size[0] * tile_size[1]:
+        return TILE_OPAQUE
+    return TILE_ALPHA
+
+
+@load_phase("classify_tileset")
+def classify_tileset(
+    sheet: pygame.Surface,
+    tileset: pytmx.TiledTileset,
+    colorkey: Optional[ColorLike],
+) -> Optional[dict]:
+    """
+    Classify every tile cell of a tileset sheet in one pass
+
+    Uses numpy (through surfarray) when available, otherwise a single mask of
+    the whole sheet.  With a colorkey, tiles without colorkey pixels are
+    classed as opaque so they don't pay for colorkey blits.
+
+    Parameters:
+        sheet: the tileset image, with per-pixel alpha
+        tileset: tileset giving the tile grid
+        colorkey: optional colorkey for the tileset image
+
+    Returns:
+        dict of tile rect: transparency class, None if it can't be checked
+
+    """
+    tw, th = tileset.tilewidth, tileset.tileheight
+    step_x, step_y = tw + tileset.spacing, th + tileset.spacing
+    xs = range(tileset.margin, tileset.width + tileset.margin - tw + 1, step_x)
+    ys = range(tileset.margin, tileset.height + tileset.margin - th + 1, step_y)
+    if not xs or not ys or tileset.width > sheet.get_width() or tileset.height > sheet.get_height():
+        return None
+    hit_class = TILE_COLORKEY if colorkey else TILE_ALPHA
+
+    if numpy is not None:
+        try:
+            if colorkey:
+                # pixels matching the colorkey
+                rgb = pygame.surfarray.array3d(sheet)
+                hits = (rgb == numpy.array(colorkey[:3], dtype=rgb.dtype)).all(axis=2)
+            else:
+                # pixels that are not fully opaque (same threshold as the mask check)
+                hits = pygame.surfarray.array_alpha(sheet) < 255
+        except Exception:
+            pass
+        else:
+            # crop to the grid and pad the spacing after the last row/column, so the
+            # sheet reshapes to (columns, step_x, rows, step_y) and cells reduce at once
+            x0, y0 = tileset.margin, tileset.margin
+            cells = numpy.zeros((len(xs) * step_x, len(ys) * step_y), dtype=bool)
+            region = hits[x0:x0 + cells.shape[0], y0:y0 + cells.shape[1]]
+            cells[: region.shape[0], : region.shape[1]] = region
+            cells = cells.reshape(len(xs), step_x, len(ys), step_y)[:, :tw, :, :th]
+            any_hit = cells.any(axis=(1, 3))
+            return {
+                (x, y, tw, th): hit_class if any_hit[i, j] else TILE_OPAQUE
+                for i, x in enumerate(xs)
+                for j, y in enumerate(ys)
+            }
+
+    try:
+        if colorkey:
+            hits = pygame.mask.from_threshold(sheet, colorkey, (1, 1, 1, 255))
+        else:
+            hits = pygame.mask.from_surface(sheet, 254)
+            hits.invert()
+    except:
+        # pygame_sdl2 will fail because the mask module is not included
+        return None
+    cell = pygame.Mask((tw, th), fill=True)
+    return {
+        (x, y, tw, th): hit_class if hits.overlap_area(cell, (x, y)) else TILE_OPAQUE
+        for x in xs
+        for y in ys
+    }
+
+
+@load_phase("smart_convert")
 def smart_convert(
     original: pygame.Surface,
     colorkey: Optional[ColorLike],
     pixelalpha: bool,
+    transparency: Optional[str] = None,
 ) -> pygame.Surface:
     """
     Return new pygame Surface with optimal pixel/data format
@@ -73,49 +207,116 @@ def smart_convert(
         original: tile surface to inspect
         colorkey: optional colorkey for the tileset image
         pixelalpha: if true, prefer per-pixel alpha surfaces
+        transparency: transparency class if already known (see classify_tileset)
 
     Returns:
         new tile surface
 
     """
-    # tiled set a colorkey
-    if colorkey:
+    if transparency is None:
+        transparency = classify_surface(original, colorkey)
+        if transparency is None:
+            # no mask module, just convert_alpha and return it
+            tile = original.convert_alpha()
+            add_surface(tile)
+            return tile
+
+    if transparency == TILE_OPAQUE:
+        tile = original.convert()
+
+    elif transparency == TILE_COLORKEY:
         tile = original.convert()
         tile.set_colorkey(colorkey, pygame.RLEACCEL)
         # TODO: if there is a colorkey, count the colorkey pixels to determine if RLEACCEL should be used
 
-    # no colorkey, so use a mask to determine if there are transparent pixels
+    # there are transparent pixels, and set for perpixel alpha
+    elif pixelalpha:
+        tile = original.convert_alpha()
+
+    # there are transparent pixels, and we won't handle them
     else:
-        tile_size = original.get_size()
-        threshold = 254  # the default
+        tile = original.convert()
 
-        try:
-            # count the number of pixels in the tile that are not transparent
-            px = pygame.mask.from_surface(original, threshold).count()
-        except:
-            # pygame_sdl2 will fail because the mask module is not included
-            # in this case, just convert_alpha and return it
-            return original.convert_alpha()
-
-        # there are no transparent pixels in the image
-        if px == tile_size[0] * tile_size[1]:
-            tile = original.convert()
-
-        # there are transparent pixels, and set for perpixel alpha
-        elif pixelalpha:
-            tile = original.convert_alpha()
+    add_surface(tile)
+    return tile
 
-        # there are transparent pixels, and we won't handle them
-        else:
-            tile = original.convert()
 
-    return tile
+def get_transparency(tile: pygame.Surface) -> str:
+    """
+    Return the transparency class of a tile loaded by pygame_image_loader
+
+    Renderers can use this to skip blending work, e.g. an opaque tile
+    completely covers whatever is beneath it.
+
+    Parameters:
+        tile: tile surface
+
+    Returns:
+        TILE_OPAQUE, TILE_COLORKEY or TILE_ALPHA
+
+    """
+    if tile.get_flags() & pygame.SRCALPHA:
+        return TILE_ALPHA
+    if tile.get_colorkey() is not None:
+        return TILE_COLORKEY
+    return TILE_OPAQUE
+
+
+# tileset images are shared by every map that uses them, so each sheet and the
+# tiles cut from it are kept for the life of the process:
+# {(abspath, colorkey, pixelalpha): [(mtime_ns, size), sheet, {rect: tile}, {rect: class}]}
+_tileset_image_cache = dict()
+
+# flipped/rotated tiles, built from the unflipped tile and shared by every map:
+# {((mtime_ns, size), abspath, colorkey, pixelalpha, rect, flags): tile}, least recently used first
+_variant_cache = OrderedDict()
+variant_cache_size = 512
+
+
+def get_tileset_images(filename: str, colorkey: Optional[str], pixelalpha: bool):
+    """
+    Return the cache entry for a tileset image
+
+    The entry is a list of the file stamp, the converted sheet, the
+    unflipped tile surfaces cut from it by rect and the transparency class of
+    its tile cells by rect (None until classified, False if it can't be).
+
+    The image is loaded once per process and reloaded only if its mtime or
+    size changes.  Surfaces are shared between maps and must not be modified.
+
+    Parameters:
+        filename: filename, including path, of the image
+        colorkey: colorkey for the image, as found in the tmx data
+        pixelalpha: if true, prefer per-pixel alpha surfaces
+
+    Returns:
+        list, as above
+
+    """
+    path = os.path.abspath(filename)
+    st = os.stat(path)
+    stamp = st.st_mtime_ns, st.st_size
+    key = path, colorkey, pixelalpha
+    cached = _tileset_image_cache.get(key)
+    if cached is None or cached[0] != stamp:
+        # converted once up front so every tile subsurface is already in display format
+        with load_span("tileset image"):
+            sheet = pygame.image.load(filename).convert_alpha()
+        add_surface(sheet)
+        cached = [stamp, sheet, dict(), None]
+        _tileset_image_cache[key] = cached
+    return cached
 
 
 def pygame_image_loader(filename: str, colorkey: Optional[ColorLike], **kwargs):
     """
     pytmx image loader for pygame
 
+    Tiles are cached per tileset image, so maps sharing a tileset share the
+    same tile surfaces and only the first map to use a tile pays for it.
+    Flipped and rotated tiles are made from the cached tile and kept in an
+    LRU cache of variant_cache_size surfaces.
+
     Parameters:
         filename: filename, including path, to load
         colorkey: colorkey for the image
@@ -124,13 +325,25 @@ def pygame_image_loader(filename: str, colorkey: Optional[ColorLike], **kwargs):
         function to load tile images
 
     """
+    pixelalpha = kwargs.get("pixelalpha", True)
+    cached = get_tileset_images(filename, colorkey, pixelalpha)
+    image, tiles = cached[1], cached[2]
+    source = cached[0], os.path.abspath(filename), colorkey, pixelalpha
+
     if colorkey:
         colorkey = pygame.Color("#{0}".format(colorkey))
 
-    pixelalpha = kwargs.get("pixelalpha", True)
-    image = pygame.image.load(filename)
+    # tile sheets are classified once, rather than a mask per tile in smart_convert
+    tileset = kwargs.get("tileset")
+    if cached[3] is None and tileset is not None:
+        cached[3] = classify_tileset(image, tileset, colorkey) or False
+    classes = cached[3] or {}
+
+    def load_tile(rect):
+        tile = tiles.get(rect)
+        if tile is not None:
+            return tile
 
-    def load_image(rect=None, flags=None):
         if rect:
             try:
                 tile = image.subsurface(rect)
@@ -140,10 +353,27 @@ def pygame_image_loader(filename: str, colorkey: Optional[ColorLike], **kwargs):
         else:
             tile = image.copy()
 
-        if flags:
-            tile = handle_transformation(tile, flags)
+        tile = smart_convert(tile, colorkey, pixelalpha, classes.get(rect))
+        tiles[rect] = tile
+        return tile
 
-        tile = smart_convert(tile, colorkey, pixelalpha)
+    def load_image(rect=None, flags=None):
+        rect = tuple(rect) if rect else None
+        if not flags or not any(flags):
+            return load_tile(rect)
+
+        key = source + (rect, flags)
+        tile = _variant_cache.get(key)
+        if tile is not None:
+            _variant_cache.move_to_end(key)
+            return tile
+
+        # flipping doesn't change which pixels are transparent, so the class still applies
+        tile = handle_transformation(load_tile(rect), flags)
+        tile = smart_convert(tile, colorkey, pixelalpha, classes.get(rect))
+        _variant_cache[key] = tile
+        if len(_variant_cache) > variant_cache_size:
+            _variant_cache.popitem(last=False)
         return tile
 
     return load_image
@@ -237,21 +467,28 @@ def build_rects(
             raise ValueError
 
     if isinstance(layer, int):
-        layer_data = tmxmap.get_layer_data(layer)
+        layer = tmxmap.layers[layer]
     elif isinstance(layer, str):
         try:
             layer = [l for l in tmxmap.layers if l.name == layer].pop()
-            layer_data = layer.data
         except IndexError:
             msg = 'Layer "{0}" not found in map {1}.'
             logger.debug(msg.format(layer, tmxmap))
             raise ValueError
 
-    p = itertools.product(range(tmxmap.width), range(tmxmap.height))
+    # tile locations come from the layer's gid index rather than a scan of the grid
     if gid:
-        points = [(x, y) for (x, y) in p if layer_data[y][x] == gid]
+        points = layer.get_tile_locations(gid)
+    elif layer.chunks:
+        # infinite layers aren't indexed, every chunk is read
+        points = [(x, y) for x, y, _gid in layer.iter_data() if _gid]
     else:
-        points = [(x, y) for (x, y) in p if layer_data[y][x]]
+        width = layer.width
+        points = [
+            (i % width, i // width)
+            for indices in layer.get_gid_index().values()
+            for i in indices
+        ]
 
     rects = simplify(points, tmxmap.tilewidth, tmxmap.tileheight)
     return rects
@@ -263,13 +500,6 @@ def simplify(
     tileheight: int,
 ) -> List[pygame.Rect]:
     """Given a list of points, return list of rects that represent them
-    kludge:
-
-    "A kludge (or kluge) is a workaround, a quick-and-dirty solution,
-    a clumsy or inelegant, yet effective, solution to a problem, typically
-    using parts that are cobbled together."
-
-    -- wikipedia
 
     turn a list of points into a rects
     adjacent rects will be combined.
@@ -300,53 +530,58 @@ def simplify(
         pretty cool, right?
 
     there may be cases where the number of rectangles is not as low as possible,
-    but I haven't found that it is excessively bad.  certainly much better than
-    making a list of rects, one for each tile on the map!
+    but it is certainly much better than making a list of rects, one for each
+    tile on the map!  see greedy_mesh, which this uses.
     """
+    return greedy_mesh(all_points, tilewidth, tileheight)[0]
 
-    def pick_rect(points, rects):
-        ox, oy = sorted([(sum(p), p) for p in points])[0][1]
-        x = ox
-        y = oy
-        ex = None
-
-        while 1:
-            x += 1
-            if not (x, y) in points:
-                if ex is None:
-                    ex = x - 1
-
-                if (ox, y + 1) in points:
-                    if x == ex + 1:
-                        y += 1
-                        x = ox
-
-                    else:
-                        y -= 1
-                        break
-                else:
-                    if x <= ex:
-                        y -= 1
-                    break
-
-        c_rect = pygame.Rect(
-            ox * tilewidth,
-            oy * tileheight,
-            (ex - ox + 1) * tilewidth,
-            (y - oy + 1) * tileheight,
-        )
 
-        rects.append(c_rect)
+def greedy_mesh(
+    points: List[PointLike],
+    tilewidth: int,
+    tileheight: int,
+) -> Tuple[List[pygame.Rect], List[List[Tuple[int, int]]]]:
+    """Merge tile points into non-overlapping rects, and say which tiles each covers
+
+    Points are visited in row-major order.  Each point not yet covered starts
+    a rect, which is grown right as far as the row is filled, then down for as
+    long as the whole span of the next row is filled too.
 
-        rect = pygame.Rect(ox, oy, ex - ox + 1, y - oy + 1)
-        kill = [p for p in points if rect.collidepoint(p)]
-        [points.remove(i) for i in kill]
+    Every point is covered once and each rect's growth only looks at the
+    points it takes plus one row below it, so after sorting the points this
+    is linear in their number.  Nothing recurses.
 
-        if points:
-            pick_rect(points, rects)
+    Parameters:
+        points: (x, y) tile coordinates to merge, duplicates are fine
+        tilewidth: width of a tile in pixels
+        tileheight: height of a tile in pixels
+
+    Returns:
+        list of pygame Rect objects in pixels, and for each rect the list of
+        (x, y) tiles it covers
 
-    rect_list = []
-    while all_points:
-        pick_rect(all_points, rect_list)
+    """
+    remaining = set(tuple(p) for p in points)
+    rects = list()
+    members = list()
+
+    for x, y in sorted(remaining, key=lambda p: (p[1], p[0])):
+        if (x, y) not in remaining:
+            continue
+
+        ex = x + 1
+        while (ex, y) in remaining:
+            ex += 1
+
+        ey = y + 1
+        while all((i, ey) in remaining for i in range(x, ex)):
+            ey += 1
+
+        cells = [(i, j) for j in range(y, ey) for i in range(x, ex)]
+        remaining.difference_update(cells)
+        rects.append(
+            pygame.Rect(x * tilewidth, y * tileheight, (ex - x) * tilewidth, (ey - y) * tileheight)
+        )
+        members.append(cells)
 
-    return rect_list
+    return rects, members
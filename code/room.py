@@ -1,22 +1,30 @@
 # - libraries -
 import pygame
-from pytmx.util_pygame import load_pygame
+import os
+import time
+from math import floor, ceil
+from pytmx.util_pygame import load_pygame, greedy_mesh
+from pytmx.telemetry import LoadReport, resume_report, suspend_report, finish_report, load_span, add_surface
 # - general -
-from game_data import controller_map, fonts, tile_size
+from game_data import controller_map, fonts, tile_size, load_report_print, load_report_file, decoration_chunk_size, world_streaming
 from support import *
 # - tiles -
-from tiles import StaticTile, CollideableTile, HazardTile
+from tiles import StaticTile, CollideableTile, HazardTile, Collider, DecorationChunk
+from light_mask import create_light_mask
 # - objects -
 from player import Player
 from trigger import Trigger, SpawnTrigger, DoorTrigger
 from spawn import Spawn
 # - systems -
 from camera import Camera
+from chunks import ChunkStreamer
 from text import Font
 
 
 class Room:
-    def __init__(self, dt, fps, room_data, screen_surface, screen_rect, controllers, previous_room):
+    # time_sliced rooms aren't built here, continue_build must be called (each frame) until it returns True
+    # tmx_data is the room's already loaded map, without its images (see RoomPrefetcher), otherwise it is loaded from room_data
+    def __init__(self, dt, fps, room_data, screen_surface, screen_rect, controllers, previous_room, time_sliced=False, tmx_data=None):
         # TODO testing, remove
         self.dev_debug = False
 
@@ -29,6 +37,7 @@ class Room:
         self.controllers = controllers
 
         self.previous_room = previous_room  # room exited when entering current room
+        self.streamed_rooms = {}  # name: room around this one in the world, scrolled with it and drawn under it (see WorldStream)
         self.player_spawn = None  # contains the current player spawn, point object (position and name)
 
         self.pause = False
@@ -44,46 +53,174 @@ class Room:
 
         #dt = dt  # dt starts as 1 because on the first frame we can assume it is 60fps. dt = 1/60 * 60 = 1
 
+        # - build -
+        self.room_data = room_data  # path of the room's file, rooms are cached by it (see RoomCache)
+        # times each phase of building the room, finished when the build is
+        self.load_report = LoadReport(os.path.basename(room_data))
+        self.builder = self.build(dt, fps, room_data, tmx_data)
+        self.built = False
+        self.tiles_per_build_step = 256  # tiles created or blitted between steps of the build
+        if not time_sliced:
+            self.continue_build()
+
+    # builds the room a step at a time, yielding between steps so the build can be spread over frames (see continue_build)
+    # the layer creating methods are steps of the build too, used with yield from, they return the layer's sprite group
+    def build(self, dt, fps, room_data, tmx_data=None):
         # - get level data -
-        tmx_data = load_pygame(resource_path(room_data))  # tile map file
+        if tmx_data is None:
+            tmx_data = self.load_map(room_data, deferred=True)
+            with load_span('load_pygame'):
+                for _ in tmx_data.iterload():  # parsed a layer at a time
+                    yield
+        else:
+            # images are converted for the display, which only the main thread can do
+            with load_span('load_pygame'):
+                tmx_data.reload_images()
+            yield
         self.all_tile_sprites = pygame.sprite.Group()  # contains all tile sprites for ease of updating/scrolling
         self.all_object_sprites = pygame.sprite.Group()
+        # infinite rooms are made of chunks, layer sprites are created and removed around the camera by streamers
+        self.infinite = tmx_data.infinite
+        self.chunk_streamers = []
+        # room bounds in px (the map size, or for infinite rooms the area covered by chunks)
+        room_x, room_y, room_width, room_height = tmx_data.get_tile_bounds()
+        self.room_dim = [room_width * tile_size, room_height * tile_size]
+        self.room_pos = (room_x * tile_size, room_y * tile_size)
 
         # get decoration layers
         self.background_layers = []  # ordered list of all background layers (in render order)
         self.foreground_layers = []  # ordered list of all foreground layers (in render order)
-        for layer in tmx_data.layernames:
+        with load_span('decoration layers'):
             # layer names is in the same order from the editor so background layers will be stored in correct order and
             # rendered in that order. In order for this to work, folder name must not contain 'background' (use bg instead)
-            if 'background' in layer:
-                self.background_layers.append(self.create_decoration_layer(tmx_data, layer))
-            # see commenting for self.background_layers
-            elif 'foreground' in layer:
-                self.foreground_layers.append(self.create_decoration_layer(tmx_data, layer))
+            background_names = [layer for layer in tmx_data.layernames if 'background' in layer]
+            # see commenting for background_names
+            foreground_names = [layer for layer in tmx_data.layernames if 'background' not in layer and 'foreground' in layer]
+            # layers that share parallax and are next to each other are merged into one (one surface and blit instead of several)
+            for layer_names in self.group_decoration_layers(tmx_data, background_names):
+                self.background_layers.append((yield from self.create_decoration_layer(tmx_data, layer_names)))
+            for layer_names in self.group_decoration_layers(tmx_data, foreground_names):
+                self.foreground_layers.append((yield from self.create_decoration_layer(tmx_data, layer_names)))
 
         # get objects
-        self.transitions = self.create_object_layer(tmx_data, 'triggers', 'Transition')
-        self.checkpoints = self.create_object_layer(tmx_data, 'triggers', 'Checkpoint')
-        self.doors = self.create_object_layer(tmx_data, 'triggers', 'Door')
-        # player must be delt with after other objects for spawns to be in place
-        self.player = self.create_object_layer(tmx_data, 'triggers', 'Player')  # spawns in triggers layer
+        with load_span('objects'):
+            self.transitions = self.create_object_layer(tmx_data, 'triggers', 'Transition')
+            self.checkpoints = self.create_object_layer(tmx_data, 'triggers', 'Checkpoint')
+            self.doors = self.create_object_layer(tmx_data, 'triggers', 'Door')
+            # player must be delt with after other objects for spawns to be in place
+            self.player = self.create_object_layer(tmx_data, 'triggers', 'Player')  # spawns in triggers layer
+        yield
+
+        # lights are masked by the background layers (mask is baked once and loaded after that), scrolled with the tiles
+        with load_span('light mask'):
+            self.light_mask = yield from create_light_mask(tmx_data, self.background_layers, self.room_dim)
+            self.all_tile_sprites.add(self.light_mask)
+        yield
 
         # get tiles
-        self.collideable = self.create_tile_layer(tmx_data, 'collideable', 'CollideableTile')
-        self.hazards = self.create_tile_layer(tmx_data, 'hazards', 'HazardTile')
+        with load_span('tile layers'):
+            self.collideable = yield from self.create_tile_layer(tmx_data, 'collideable', 'CollideableTile')
+        yield
+        with load_span('colliders'):
+            self.colliders = self.create_collider_layer(tmx_data, 'collideable')
+        yield
+        with load_span('tile layers'):
+            self.hazards = yield from self.create_tile_layer(tmx_data, 'hazards', 'HazardTile')
+        yield
 
         # - camera setup -
-        room_dim = [tmx_data.width * tile_size, tmx_data.height * tile_size]
-        self.camera = Camera(self.screen_surface, self.screen_rect, room_dim, self.player.sprite, controllers)
+        with load_span('camera focus'):
+            self.focus_camera(dt, fps)
+
+        # - text setup -
+        self.small_font = Font(resource_path(fonts['small']), 'white')
+        self.large_font = Font(resource_path(fonts['large']), 'white')
+
+    # creates the camera and focuses it on the player, scrolling the whole room to match
+    def focus_camera(self, dt, fps):
+        self.camera = Camera(self.screen_surface, self.screen_rect, self.room_dim, self.player.sprite, self.controllers, self.room_pos)
         self.camera.focus(True)  # focuses camera on target
         scroll_value = self.camera.get_scroll(dt, fps)  # returns scroll, now focused
         self.player.sprite.apply_scroll(scroll_value)  # applies new scroll to player
         self.all_tile_sprites.update(scroll_value)  # applies new scroll to all tile sprites
         self.all_object_sprites.update(scroll_value)  # applies new scroll to all object sprites
+        self.stream_chunks()  # creates sprites for the chunks around the focused camera
 
-        # - text setup -
-        self.small_font = Font(resource_path(fonts['small']), 'white')
-        self.large_font = Font(resource_path(fonts['large']), 'white')
+    # makes a built room that was left earlier (see RoomCache) the active room again, entered from previous_room.
+    # Only what changes while a room is played is reset, the tiles, layers and masks are kept as they are
+    def reactivate(self, dt, fps, previous_room):
+        self.previous_room = previous_room
+        self.pause = False
+        self.pause_pressed = False
+        self.req_respawn = False
+        self.fade_timer = 0
+        self.fade_surf.set_alpha(0)
+
+        self.reset_scroll()
+
+        # player at the spawn of the room entered from
+        self.player_spawn = self.get_spawn(previous_room)
+        self.player.sprite.player_respawn(self.player_spawn)
+        self.player.sprite.interact = False
+
+        self.focus_camera(dt, fps)
+
+    # scroll origin, everything back where the room was built before the camera scrolled it
+    def reset_scroll(self):
+        for sprite in self.all_tile_sprites.sprites() + self.all_object_sprites.sprites():
+            sprite.reset_pos()
+        self.camera.room_rect.topleft = self.camera.room_pos
+
+    # scrolls the room without updating anything else in it, for rooms streamed around the active room
+    def apply_scroll(self, scroll_value):
+        for sprite in self.all_tile_sprites:
+            sprite.apply_scroll(scroll_value)
+        self.all_object_sprites.update(scroll_value)
+        self.camera.room_rect.move_ip(-scroll_value[0], -scroll_value[1])
+        self.stream_chunks()
+
+    # lines the room up with a room it is next to in the world, offset is this room's top left from the other room's
+    # (world pixels). The room then has to be scrolled with the other room to stay lined up
+    def align(self, room, offset):
+        self.reset_scroll()
+        scroll_total = room.camera.get_scroll_total()
+        self.apply_scroll([scroll_total[0] - offset[0], scroll_total[1] - offset[1]])
+
+    # loads the tile map file of a room (cached next to the tmx after first load). A deferred map is loaded by calling
+    # its iterload, otherwise it is loaded here. Without load_images, its reload_images must be called before it's used
+    @staticmethod
+    def load_map(room_data, deferred=False, load_images=True):
+        return load_pygame(resource_path(room_data), cache=True, stream=True, object_records=True, deferred=deferred,
+                           load_images=load_images)
+
+    # advances the build until it is complete, or budget_ms has been spent on it this call. Returns True once complete
+    def continue_build(self, budget_ms=None):
+        if self.built:
+            return True
+        end_time = time.perf_counter() + budget_ms / 1000 if budget_ms is not None else None
+
+        # the report only counts the time spent building, not the frames in between
+        resume_report(self.load_report)
+        finished = False
+        try:
+            for _ in self.builder:
+                if end_time is not None and time.perf_counter() >= end_time:
+                    return False
+            finished = True
+        finally:
+            # the report is never left active on this thread, even when building raises part way through
+            if finished:
+                finish_report()
+            else:
+                suspend_report(self.load_report)
+
+        # - load report -
+        if load_report_print:
+            print(self.load_report.format())
+        if load_report_file:
+            self.load_report.write_json_lines(load_report_file)
+        self.built = True
+        return True
 
 # -- set up room methods --
 
@@ -91,35 +228,45 @@ class Room:
     def create_tile_layer(self, tmx_file, layer_name, type):
         sprite_group = pygame.sprite.Group()
         layer = tmx_file.get_layer_by_name(layer_name)
-        tiles = layer.tiles()
         parallax = (layer.parallaxx, layer.parallaxy)
 
-        if type == "StaticTile":
-            # gets layer from tmx and creates StaticTile for every tile in the layer, putting them in both SpriteGroups
-            for x, y, surface in tiles:
-                tile = StaticTile((x * tile_size, y * tile_size), (tile_size, tile_size), parallax, surface)
-                sprite_group.add(tile)
-                self.all_tile_sprites.add(tile)
+        if type not in ('StaticTile', 'CollideableTile', 'HazardTile'):
+            raise Exception(f"Invalid create_tile_group type: '{type}' ")
 
-        elif type == 'CollideableTile':
-            for x, y, surface in tiles:
-                tile = CollideableTile((x * tile_size, y * tile_size), (tile_size, tile_size), parallax, surface)
-                sprite_group.add(tile)
-                self.all_tile_sprites.add(tile)
-
-        elif type == 'HazardTile':
-            for x, y, surface in tiles:
-                # tile properties brought over from tiled. Including tile colliders. Allows for hitboxes custom to tile from tilesheet
-                properties = tmx_file.get_tile_properties(x, y, layer.id)
-                tile = HazardTile((x * tile_size, y * tile_size), (tile_size, tile_size), parallax, surface, self.player.sprite, properties)
-                sprite_group.add(tile)
-                self.all_tile_sprites.add(tile)
+        # infinite room layer, tiles are created a chunk at a time as the camera approaches (see stream_chunks)
+        if layer.chunks:
+            def make_chunk_tiles(chunk):
+                images = tmx_file.images
+                return [self.create_tile(type, x, y, parallax, images[gid], tmx_file.get_tile_properties_by_gid(gid))
+                        for x, y, gid in layer.iter_chunk_data(*chunk) if gid]
 
-        else:
-            raise Exception(f"Invalid create_tile_group type: '{type}' ")
+            self.chunk_streamers.append(ChunkStreamer(layer, sprite_group, self.all_tile_sprites, make_chunk_tiles))
+            return sprite_group
+
+        # tile properties brought over from tiled. Including tile colliders. Allows for hitboxes custom to tile from tilesheet
+        properties = tmx_file.get_layer_tile_properties(layer.id) if type == 'HazardTile' else {}
+
+        # gets layer from tmx and creates a tile for every tile in the layer, putting them in both SpriteGroups
+        for i, (x, y, surface) in enumerate(layer.tiles(), 1):
+            tile = self.create_tile(type, x, y, parallax, surface, properties.get((x, y)))
+            sprite_group.add(tile)
+            self.all_tile_sprites.add(tile)
+            if i % self.tiles_per_build_step == 0:
+                yield
 
         return sprite_group
 
+    # creates a single tile of the given type at tile position x, y
+    def create_tile(self, type, x, y, parallax, surface, properties=None):
+        pos = (x * tile_size, y * tile_size)
+        size = (tile_size, tile_size)
+        if type == 'StaticTile':
+            return StaticTile(pos, size, parallax, surface)
+        elif type == 'CollideableTile':
+            return CollideableTile(pos, size, parallax, surface)
+        else:
+            return HazardTile(pos, size, parallax, surface, self.player.sprite, properties)
+
     def create_object_layer(self, tmx_file, layer_name, object_class):
         sprite_group = pygame.sprite.Group()
         if layer_name:  # prevents accessing '' layer in case of player
@@ -154,14 +301,7 @@ class Room:
 
         elif object_class == 'Player':
             sprite_group = pygame.sprite.GroupSingle()
-            # find correct spawn for prev room that is attatched to either a checkpoint, room transition or door object
-            # spawn point must be attatched because otherwise spawn point does not get updated with scroll
-            for obj in self.all_object_sprites:
-                # if name of obj is prev room, indicates attatched to spawn allocated for transition from prev room
-                # also every obj has name attr by default even if unfilled
-                if obj.name == self.previous_room:
-                    spawn = obj.spawn
-                    break
+            spawn = self.get_spawn(self.previous_room)
             # create player
             player = Player(self, spawn)
             sprite_group.add(player)
@@ -172,6 +312,20 @@ class Room:
 
         return sprite_group
 
+    # find correct spawn for prev room that is attatched to either a checkpoint, room transition or door object
+    # spawn point must be attatched because otherwise spawn point does not get updated with scroll
+    # rooms streamed in next to a room they have no transition to use any of their spawns (see WorldStream)
+    def get_spawn(self, previous_room):
+        any_spawn = None
+        for obj in self.all_object_sprites:
+            # if name of obj is prev room, indicates attatched to spawn allocated for transition from prev room
+            # also every obj has name attr by default even if unfilled
+            if obj.name == previous_room:
+                return obj.spawn
+            if any_spawn is None and hasattr(obj, 'spawn'):
+                any_spawn = obj.spawn
+        return any_spawn
+
     def create_image_layer(self, tmx_file, layer_name):
         sprite_group = pygame.sprite.GroupSingle()
         layer = tmx_file.get_layer_by_name(layer_name)
@@ -183,33 +337,168 @@ class Room:
         self.all_tile_sprites.add(tile)
         return sprite_group
 
-    # any layer that is purely for visuals, including parallax layers
-    def create_decoration_layer(self, tmx_file, layer_name):
-        sprite_group = pygame.sprite.GroupSingle()
+    # merges the tiles of a collideable layer into as few rects as possible, so collision checks only look at the tiles of
+    # the few that touch the player (see Player.get_tiles_near). The tiles themselves are still used for drawing
+    def create_collider_layer(self, tmx_file, layer_name):
         layer = tmx_file.get_layer_by_name(layer_name)
-        parallax = (layer.parallaxx, layer.parallaxy)
 
-        surf = pygame.Surface((tmx_file.width * tile_size, tmx_file.height * tile_size))
-        surf.set_colorkey((0, 0, 0))
+        # infinite room tiles only exist around the camera, they are collided with directly
+        if layer.chunks:
+            return self.collideable
 
-        # tile layers
-        if layer.type == 'tile decoration':
-            for x, y, surface in layer.tiles():
-                if surface:
-                    surf.blit(surface, (x * tile_size, y * tile_size))
+        sprite_group = pygame.sprite.Group()
+        parallax = (layer.parallaxx, layer.parallaxy)
+        width = layer.width
+        points = [(i % width, i // width) for i, gid in enumerate(layer.gids) if gid]
+        # each collider keeps the tiles it covers, which are what is collided with once the collider is
+        tiles = {(tile.original_pos[0] // tile_size, tile.original_pos[1] // tile_size): tile for tile in self.collideable}
+        rects, members = greedy_mesh(points, tile_size, tile_size)
+        for rect, cells in zip(rects, members):
+            collider = Collider(rect, parallax, [tiles[cell] for cell in cells])
+            sprite_group.add(collider)
+            self.all_tile_sprites.add(collider)
 
-        # object layers
-        elif layer.type == 'object decoration':  # layer in tmx_file.objectgroups:
-            for obj in layer:
-                surf.blit(obj.image, (obj.x, obj.y))
+        return sprite_group
+
+    # any layers that are purely for visuals, including parallax layers. The layers are drawn together as one, so they
+    # must be consecutive and share parallax (see group_decoration_layers)
+    def create_decoration_layer(self, tmx_file, layer_names):
+        layers = [tmx_file.get_layer_by_name(layer_name) for layer_name in layer_names]
+        parallax = (layers[0].parallaxx, layers[0].parallaxy)
+
+        # infinite rooms can't have room sized layer surfaces. Tile layers get a surface per chunk, streamed in and out
+        # around the camera, and objects are each their own tile
+        if self.infinite:
+            sprite_group = pygame.sprite.Group()
+            for layer in layers:
+                if layer.type == 'tile decoration':
+                    def make_chunk_surface(chunk, layer=layer):
+                        chunk_x, chunk_y = chunk
+                        width, height = layer.chunk_width * tile_size, layer.chunk_height * tile_size
+                        surf = pygame.Surface((width, height))
+                        surf.set_colorkey((0, 0, 0))
+                        add_surface(surf)
+                        images = tmx_file.images
+                        for x, y, gid in layer.iter_chunk_data(chunk_x, chunk_y):
+                            if gid:
+                                surf.blit(images[gid], ((x - chunk_x) * tile_size, (y - chunk_y) * tile_size))
+                        return [StaticTile((chunk_x * tile_size, chunk_y * tile_size), (width, height), parallax, surf)]
+
+                    self.chunk_streamers.append(ChunkStreamer(layer, sprite_group, self.all_tile_sprites, make_chunk_surface))
+                elif layer.type == 'object decoration':
+                    for obj in layer:
+                        tile = StaticTile((obj.x, obj.y), (obj.width, obj.height), parallax, obj.image)
+                        sprite_group.add(tile)
+                        self.all_tile_sprites.add(tile)
+            return sprite_group
+
+        # finite rooms, the layers are drawn onto a grid of chunk surfaces. Only chunks with something drawn on them are
+        # made, so memory follows what is painted rather than the room size, and only chunks on screen are drawn
+        # parallax layers only have chunks for the part of them that can ever be on screen
+        sprite_group = pygame.sprite.Group()
+        visible = self.get_layer_visible_rect(parallax)
+
+        # what each layer draws on each chunk, chunk key: list of (image, pos) per layer
+        chunk_blits = {}
+
+        def add_blit(layer_index, image, pos):
+            pos = (int(pos[0]), int(pos[1]))  # object positions can be floats, blit truncates them the same way
+            # images can cover several chunks, only the parts that can be seen are drawn
+            left = max(pos[0], visible.left) // decoration_chunk_size
+            top = max(pos[1], visible.top) // decoration_chunk_size
+            right = (min(pos[0] + image.get_width(), visible.right) - 1) // decoration_chunk_size
+            bottom = (min(pos[1] + image.get_height(), visible.bottom) - 1) // decoration_chunk_size
+            for chunk_x in range(left, right + 1):
+                for chunk_y in range(top, bottom + 1):
+                    if (chunk_x, chunk_y) not in chunk_blits:
+                        chunk_blits[(chunk_x, chunk_y)] = [[] for _ in layers]
+                    chunk_blits[(chunk_x, chunk_y)][layer_index].append((image, pos))
+
+        for layer_index, layer in enumerate(layers):
+            # tile layers
+            if layer.type == 'tile decoration':
+                for i, (x, y, surface) in enumerate(layer.tiles(), 1):
+                    if surface:
+                        add_blit(layer_index, surface, (x * tile_size, y * tile_size))
+                    if i % self.tiles_per_build_step == 0:
+                        yield
+
+            # object layers
+            elif layer.type == 'object decoration':  # layer in tmx_file.objectgroups:
+                for obj in layer:
+                    add_blit(layer_index, obj.image, (obj.x, obj.y))
+
+        # when more than one layer draws on a chunk, layers after the first are drawn on a scratch surface which is then
+        # drawn onto the chunk with the colorkey, like drawing the layers one after the other would (black tile pixels
+        # are see-through, not black)
+        layer_surf = None
+        for (chunk_x, chunk_y), layer_blits in sorted(chunk_blits.items()):
+            chunk_rect = pygame.Rect(chunk_x * decoration_chunk_size, chunk_y * decoration_chunk_size,
+                                     decoration_chunk_size, decoration_chunk_size).clip(visible)
+            x, y = chunk_rect.topleft
+            surf = pygame.Surface(chunk_rect.size)
+            surf.set_colorkey((0, 0, 0))
+            add_surface(surf)
+
+            first_layer = True
+            for blits in layer_blits:
+                if not blits:
+                    continue
+                blits = [(image, (pos[0] - x, pos[1] - y)) for image, pos in blits]
+                if first_layer:
+                    surf.blits(blits, False)
+                    first_layer = False
+                else:
+                    if layer_surf is None:
+                        layer_surf = pygame.Surface((decoration_chunk_size, decoration_chunk_size))
+                        layer_surf.set_colorkey((0, 0, 0))
+                    layer_surf.fill((0, 0, 0))
+                    layer_surf.blits(blits, False)
+                    surf.blit(layer_surf, (0, 0))
+
+            tile = DecorationChunk((x, y), surf.get_size(), parallax, surf)
+            sprite_group.add(tile)
+            self.all_tile_sprites.add(tile)
+            yield
 
-        tile = StaticTile((0, 0), (surf.get_width(), surf.get_height()), parallax, surf)
-        sprite_group.add(tile)
-        self.all_tile_sprites.add(tile)
         return sprite_group
 
+    # area of a layer (layer px) that can ever be on screen. The camera keeps the screen within the room, so a layer
+    # scrolled at parallax p only ever shows p times the room's extent (less a screen) plus a screen of it
+    def get_layer_visible_rect(self, parallax):
+        room_rect = pygame.Rect(self.room_pos, self.room_dim)
+        if world_streaming:
+            return room_rect  # the camera can go into rooms streamed around this one, past the room's edges
+
+        # scroll is rounded when applied, so a pixel either side is kept
+        left = floor(room_rect.x * parallax[0]) - 1
+        top = floor(room_rect.y * parallax[1]) - 1
+        right = ceil((room_rect.x + max(room_rect.width - self.screen_width, 0)) * parallax[0]) + self.screen_width + 1
+        bottom = ceil((room_rect.y + max(room_rect.height - self.screen_height, 0)) * parallax[1]) + self.screen_height + 1
+        return pygame.Rect(left, top, right - left, bottom - top).clip(room_rect)
+
+    # splits decoration layer names (in render order) into runs of consecutive layers with the same parallax. Nothing is
+    # drawn between background layers, or between foreground layers, so each run can be drawn as one layer
+    def group_decoration_layers(self, tmx_file, layer_names):
+        groups = []
+        for layer_name in layer_names:
+            layer = tmx_file.get_layer_by_name(layer_name)
+            parallax = (layer.parallaxx, layer.parallaxy)
+            if groups and groups[-1][0] == parallax:
+                groups[-1][1].append(layer_name)
+            else:
+                groups.append((parallax, [layer_name]))
+        return [group_names for parallax, group_names in groups]
+
 # -- systems --
 
+    # creates the sprites of chunks the camera is approaching and removes ones it has left behind (infinite rooms)
+    def stream_chunks(self):
+        if self.chunk_streamers:
+            scroll_total = self.camera.get_scroll_total()
+            for streamer in self.chunk_streamers:
+                streamer.update(self.screen_rect, scroll_total)
+
     def get_input(self):
         keys = pygame.key.get_pressed()
 
@@ -244,11 +533,18 @@ class Room:
                 return True
         return False
 
+    # names of the rooms this room's transitions and doors lead to
+    def get_neighbouring_rooms(self):
+        return list(dict.fromkeys(trigger.name for trigger in self.transitions.sprites() + self.doors.sprites()))
+
     # checks if player has collided with a room_transition trigger or has interacted with door
     def room_transitions(self):
         player = self.player.sprite
         # loop through all the game objects for the level transition trigger rectangles
         for trigger in self.transitions:
+            # rooms streamed in around this one are walked into instead
+            if trigger.name in self.streamed_rooms:
+                continue
             # if player has hit a transition, return the transition (new room's) name to the main game loop for new instance
             # otherwise return false
             if trigger.hitbox.colliderect(player.hitbox):
@@ -284,6 +580,36 @@ class Room:
 
 # -- visual --
 
+    # draws the room as it currently is, without updating it
+    def draw(self):
+        for room in self.streamed_rooms.values():
+            room.draw_scenery()
+
+        # Draw layers
+        for layer in self.background_layers:
+            self.draw_tile_group(layer)
+        self.player.sprite.draw()
+        self.draw_tile_group(self.collideable)
+        self.draw_tile_group(self.hazards)
+        self.draw_doors()
+        for layer in self.foreground_layers:
+            self.draw_tile_group(layer)
+
+        self.screen_surface.blit(self.fade_surf, (0, 0))
+
+        # must be after other renders to ensure menu is drawn last
+        if self.pause:
+            self.pause_menu()
+
+    # draws the room's layers without its player, doors or overlays, for rooms streamed around the active room
+    def draw_scenery(self):
+        for layer in self.background_layers:
+            self.draw_tile_group(layer)
+        self.draw_tile_group(self.collideable)
+        self.draw_tile_group(self.hazards)
+        for layer in self.foreground_layers:
+            self.draw_tile_group(layer)
+
     # draw tiles in tile group but only if in camera view (in tile.draw method)
     def draw_tile_group(self, group):
         for tile in group:
@@ -325,6 +651,12 @@ class Room:
     def get_camera_zoom(self):
         return self.camera.get_zoom()
 
+    # colliders of this room and the rooms streamed around it, so the player can stand on either while crossing over
+    def get_colliders(self):
+        if not self.streamed_rooms:
+            return self.colliders
+        return self.colliders.sprites() + [collider for room in self.streamed_rooms.values() for collider in room.colliders]
+
 # -------------------------------------------------------------------------------- #
 
     # updates the level allowing tile scroll and displaying tiles to screen
@@ -358,30 +690,19 @@ class Room:
                     break
 
         # -- UPDATES -- player needs to be before tiles for scroll to function properly
-            player.update(dt, self.collideable, scroll_value)
+            player.update(dt, self.get_colliders(), scroll_value)
             self.all_tile_sprites.update(scroll_value)
             self.all_object_sprites.update(scroll_value)
+            self.stream_chunks()
+            for room in self.streamed_rooms.values():
+                room.apply_scroll(scroll_value)
 
         # if checks have been prevented, check if player needs respawn therefore requesting level respawn
         elif player.get_respawn():
             self.req_respawn = True
 
         # -- RENDER --
-        # Draw layers
-        for layer in self.background_layers:
-            self.draw_tile_group(layer)
-        self.player.sprite.draw()
-        self.draw_tile_group(self.collideable)
-        self.draw_tile_group(self.hazards)
-        self.draw_doors()
-        for layer in self.foreground_layers:
-            self.draw_tile_group(layer)
-
-        self.screen_surface.blit(self.fade_surf, (0, 0))
-
-        # must be after other renders to ensure menu is drawn last
-        if self.pause:
-            self.pause_menu()
+        self.draw()
 
         # TODO placed before checks??
         if self.req_respawn:
@@ -413,3 +734,6 @@ class Room:
             for door in self.doors:
                 pygame.draw.rect(self.screen_surface, 'purple', door.hitbox, 1)
                 door.draw(self.screen_surface)
+
+            ####### where the time of loading this room went #######
+            self.small_font.render('\n'.join(self.load_report.lines(2)), self.screen_surface, (0, 12))
@@ -0,0 +1,24 @@
+from collections import OrderedDict
+
+
+# keeps the most recently left rooms fully built, so going back to one only has to reactivate it (see Room.reactivate)
+# rather than build it again. Rooms are kept by the path of their file, the least recently left are dropped first
+class RoomCache:
+    def __init__(self, size):
+        self.size = size  # max number of rooms kept, each holds all of its layer surfaces
+        self.rooms = OrderedDict()  # room path: room, least recently left first
+
+    def __contains__(self, room_data):
+        return room_data in self.rooms
+
+    # keeps a room that has just been left, dropping the least recently left room if over size
+    def add(self, room):
+        self.rooms[room.room_data] = room
+        self.rooms.move_to_end(room.room_data)
+        while len(self.rooms) > self.size:
+            self.rooms.popitem(last=False)
+
+    # returns the room built from the file at room_data and removes it from the cache (it is now the active room), or
+    # None if it isn't cached
+    def take(self, room_data):
+        return self.rooms.pop(room_data, None)
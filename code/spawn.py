@@ -25,3 +25,7 @@ class Spawn(pygame.sprite.Sprite):
 
     def update(self, scroll_value, use_parallax=False):
         self.apply_scroll(scroll_value, use_parallax)
+
+    # undoes all scroll applied to the spawn
+    def reset_pos(self):
+        self.x, self.y = self.original_pos
@@ -31,12 +31,64 @@ class StaticTile(pygame.sprite.Sprite):
     def update(self, scroll_value):
         self.apply_scroll(scroll_value)
 
+    # undoes all scroll applied to the tile
+    def reset_pos(self):
+        self.pos = [self.original_pos[0], self.original_pos[1]]
+        self.rect.topleft = self.original_pos
+
     def draw(self, screen, screen_rect):
         # if the tile is within the screen, render tile
         if self.rect.colliderect(screen_rect):
             screen.blit(self.image, self.rect)
 
 
+# one chunk of a decoration layer, which is stored as a grid of them (see Room.create_decoration_layer). pos scrolls the
+# layer's origin and the chunk is drawn at its offset from it, so every chunk of a layer rounds to the same pixel and
+# the layer is drawn exactly as one surface would be, without seams between chunks
+class DecorationChunk(StaticTile):
+    def __init__(self, offset, size, parallax, surface):
+        super().__init__((0, 0), size, parallax, surface)
+        self.offset = offset  # position of the chunk in the layer
+        self.rect.topleft = offset
+
+    def apply_scroll(self, scroll_value):
+        super().apply_scroll(scroll_value)
+        self.rect.move_ip(self.offset)
+
+    def reset_pos(self):
+        super().reset_pos()
+        self.rect.move_ip(self.offset)
+
+
+# invisible block of merged collideable tiles, only has a hitbox. Collision checks run against a few of these instead of
+# every tile, then against the tiles of the ones that collide (see Room.create_collider_layer)
+class Collider(pygame.sprite.Sprite):
+    def __init__(self, rect, parallax, tiles):
+        super().__init__()
+        self.tiles = tiles  # the collideable tiles merged into it, in row-major order
+        self.original_pos = (rect.x, rect.y)
+        self.pos = [rect.x, rect.y]  # allows for float coordinates for parallax moving
+        self.rect = pygame.Rect(rect)
+        self.hitbox = pygame.Rect(rect)
+        self.parallax = parallax
+
+    # scrolls exactly like the tiles it was merged from, so the hitbox stays on them
+    def apply_scroll(self, scroll_value):
+        self.pos[0] -= scroll_value[0] * self.parallax[0]
+        self.pos[1] -= scroll_value[1] * self.parallax[1]
+        self.rect.x = self.pos[0]
+        self.rect.y = self.pos[1]
+        self.hitbox.topleft = self.rect.topleft
+
+    def update(self, scroll_value):
+        self.apply_scroll(scroll_value)
+
+    def reset_pos(self):
+        self.pos = [self.original_pos[0], self.original_pos[1]]
+        self.rect.topleft = self.original_pos
+        self.hitbox.topleft = self.original_pos
+
+
 # terrain tile type, inherits from main tile and can be assigned an image
 class CollideableTile(StaticTile):
     def __init__(self, pos, size, parallax, surface):
@@ -57,6 +109,11 @@ class CollideableTile(StaticTile):
         self.hitbox.x = self.pos[0] + self.hitbox_offset[0]
         self.hitbox.y = self.pos[1] + self.hitbox_offset[1]
 
+    def reset_pos(self):
+        super().reset_pos()
+        self.hitbox.x = self.pos[0] + self.hitbox_offset[0]
+        self.hitbox.y = self.pos[1] + self.hitbox_offset[1]
+
 
 class HazardTile(CollideableTile):
     def __init__(self, pos, size, parallax, surface, player, properties=None):
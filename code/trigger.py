@@ -23,6 +23,10 @@ class Trigger(pygame.sprite.Sprite):
     def update(self, scroll_value, use_parallax=False):
         self.apply_scroll(scroll_value, use_parallax)
 
+    # undoes all scroll applied to the trigger
+    def reset_pos(self):
+        self.hitbox.topleft = self.original_pos
+
 
 # stores correspoding in-room spawn as property
 class SpawnTrigger(Trigger):
@@ -42,6 +46,10 @@ class SpawnTrigger(Trigger):
             self.hitbox.y -= int(scroll_value[1])
         self.spawn.update(scroll_value)
 
+    def reset_pos(self):
+        super().reset_pos()
+        self.spawn.reset_pos()
+
 
 class DoorTrigger(SpawnTrigger):
     def __init__(self, x, y, width, height, name, parallax, spawn, text):
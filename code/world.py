@@ -0,0 +1,47 @@
+import pygame
+import json
+import os
+from support import resource_path
+
+
+# reads a tiled .world file, which places every room of the world in one space. Rooms are known by their file name
+# without extension (the same names room transitions and doors use)
+class World:
+    def __init__(self, world_path):
+        self.rooms = {}  # room name: (room file path relative to the code folder, rect of the room in world pixels)
+        with open(resource_path(world_path)) as file:
+            world_data = json.load(file)
+
+        # map paths in a world file are relative to the world file
+        world_dir = os.path.dirname(world_path)
+        for room in world_data.get('maps', []):
+            path = os.path.normpath(os.path.join(world_dir, room['fileName'])).replace(os.sep, '/')
+            name = os.path.splitext(os.path.basename(path))[0]
+            rect = pygame.Rect(room['x'], room['y'], room['width'], room['height'])
+            self.rooms[name] = (path, rect)
+
+    # returns the path of a room's file, or None if the room isn't in the world
+    def get_room_path(self, name):
+        room = self.rooms.get(name)
+        return room[0] if room else None
+
+    # returns the rect of a room in the world, or None if the room isn't in the world
+    def get_room_rect(self, name):
+        room = self.rooms.get(name)
+        return room[1] if room else None
+
+    # returns the names of the rooms that overlap rect (world pixels), rooms without a size count as their top left
+    def get_rooms_in(self, rect):
+        names = []
+        for name, (path, room_rect) in self.rooms.items():
+            if room_rect.colliderect(rect) if room_rect.width and room_rect.height else rect.collidepoint(room_rect.topleft):
+                names.append(name)
+        return names
+
+    # returns the distance between the centres of two rooms, rooms not in the world are treated as furthest away
+    def get_room_distance(self, name, other_name):
+        rect = self.get_room_rect(name)
+        other_rect = self.get_room_rect(other_name)
+        if rect is None or other_rect is None:
+            return float('inf')
+        return pygame.math.Vector2(rect.center).distance_to(other_rect.center)
@@ -0,0 +1,110 @@
+import os
+from support import resource_path
+
+
+# keeps the rooms around the active room resident, laid out as they are in the world file. Rooms within margin of the
+# screen are built a slice each frame (or taken from the room cache), lined up with the active room and then scrolled
+# and drawn with it (Room.streamed_rooms). The player walks from one into the next without a room transition, the room
+# the player is in becomes the active room. Rooms further than twice margin away go back into the room cache
+class WorldStream:
+    def __init__(self, world, room, name, create_room, get_room_path, room_cache, margin, build_budget):
+        self.world = world
+        self.room = room  # active room, the one the player is in
+        self.name = name
+        self.create_room = create_room  # function(room name, previous room, dt, fps) -> time sliced Room
+        self.get_room_path = get_room_path  # function(room name) -> room file path, the same one main uses
+        self.room_cache = room_cache
+        self.margin = margin  # px
+        self.build_budget = build_budget  # ms of each frame spent building rooms
+        self.building = {}  # name: room being built, a slice each frame
+        self.missing = set()  # rooms in the world without a file
+
+    # makes room the active room after a room transition, the rooms that were around the previous one are dropped
+    def set_room(self, room, name):
+        for streamed_name, streamed_room in self.room.streamed_rooms.items():
+            if streamed_name != name:
+                self.room_cache.add(streamed_room)
+        self.room.streamed_rooms = {}
+        self.room.camera.bounds_rects = []
+        self.building = {}
+        self.room = room
+        self.name = name
+
+    def update(self, dt, fps):
+        self.cross_edges()
+        self.stream(dt, fps)
+        self.room.camera.bounds_rects = [room.camera.room_rect for room in self.room.streamed_rooms.values()]
+
+    # makes the streamed room the player has walked into the active room
+    def cross_edges(self):
+        player = self.room.player.sprite
+        if self.room.req_respawn or self.room.camera.room_rect.collidepoint(player.hitbox.center):
+            return
+        for name, room in self.room.streamed_rooms.items():
+            if room.camera.room_rect.collidepoint(player.hitbox.center):
+                self.enter(name, room)
+                return
+
+    def enter(self, name, room):
+        previous_room, previous_name = self.room, self.name
+
+        # the rooms around the previous room are around this one now, the previous room included
+        room.streamed_rooms = previous_room.streamed_rooms
+        del room.streamed_rooms[name]
+        room.streamed_rooms[previous_name] = previous_room
+        previous_room.streamed_rooms = {}
+        previous_room.camera.bounds_rects = []
+
+        # everything is lined up already, the player and camera carry on from where they were
+        room.player.sprite.take_over(previous_room.player.sprite)
+        room.camera.take_over(previous_room.camera)
+        room.previous_room = previous_name
+        room.player_spawn = room.get_spawn(previous_name)
+        room.dev_debug = previous_room.dev_debug
+
+        self.room = room
+        self.name = name
+
+    # names of the rooms in the world within margin of the screen, other than the active room
+    def get_rooms_near(self, margin):
+        room_rect = self.world.get_room_rect(self.name)
+        scroll_total = self.room.camera.get_scroll_total()
+        view = self.room.screen_rect.move(room_rect.x + scroll_total[0], room_rect.y + scroll_total[1])
+        return [name for name in self.world.get_rooms_in(view.inflate(margin * 2, margin * 2))
+                if name != self.name and name not in self.missing]
+
+    # starts building the rooms that have come near, drops the ones that are far away and advances the builds
+    def stream(self, dt, fps):
+        if self.world.get_room_rect(self.name) is None:
+            return  # the active room isn't in the world
+
+        keep = self.get_rooms_near(self.margin * 2)
+        for name in [name for name in self.room.streamed_rooms if name not in keep]:
+            self.room_cache.add(self.room.streamed_rooms.pop(name))
+        for name in [name for name in self.building if name not in keep]:
+            del self.building[name]
+
+        for name in self.get_rooms_near(self.margin):
+            if name in self.room.streamed_rooms or name in self.building:
+                continue
+            path = self.get_room_path(name)
+            room = self.room_cache.take(path)
+            if room:
+                self.add_room(name, room)
+            elif not os.path.exists(resource_path(path)):
+                self.missing.add(name)
+            else:
+                self.building[name] = self.create_room(name, self.name, dt, fps)
+
+        # one room is built at a time, so a frame never spends more than the budget on it
+        if self.building:
+            name = next(iter(self.building))
+            if self.building[name].continue_build(self.build_budget):
+                self.add_room(name, self.building.pop(name))
+
+    # lines a built room up with the active room, from where they are in the world
+    def add_room(self, name, room):
+        room_rect = self.world.get_room_rect(self.name)
+        other_rect = self.world.get_room_rect(name)
+        room.align(self.room, (other_rect.x - room_rect.x, other_rect.y - room_rect.y))
+        self.room.streamed_rooms[name] = room
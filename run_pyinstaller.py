@@ -3,17 +3,26 @@ import PyInstaller.__main__
 PyInstaller.__main__.run([
     'code/main.py',
     'code/camera.py',
+    'code/chunks.py',
+    'code/light_mask.py',
     'code/lighting.py',
     'code/game_data.py',
     'code/player.py',
+    'code/prefetch.py',
     'code/room.py',
+    'code/room_cache.py',
     'code/spawn.py',
     'code/support.py',
     'code/tiles.py',
     'code/text.py',
     'code/trigger.py',
+    'code/world.py',
+    'code/world_stream.py',
     'code/pytmx/pytmx.py',
     'code/pytmx/util_pygame.py',
+    'code/pytmx/map_cache.py',
+    'code/pytmx/tiled_json.py',
+    'code/pytmx/telemetry.py',
 
     '--onefile',
     '--noconsole',
@@ -0,0 +1,349 @@
+import json
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "code"))
+
+from pytmx import TiledClassType, TiledMap, TiledObject, TiledObjectRecord, TiledTileLayer  # noqa: E402
+from pytmx.util_pygame import build_rects  # noqa: E402
+
+# an infinite map, one tile layer of two 4x4 chunks, the second one left of and above the origin
+INFINITE_MAP = """<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.10" orientation="orthogonal" renderorder="right-down" width="8" height="8"
+     tilewidth="16" tileheight="16" infinite="1" nextlayerid="2" nextobjectid="1">
+ <tileset firstgid="1" name="tiles" tilewidth="16" tileheight="16" tilecount="2" columns="2">
+  <tile id="1">
+   <properties>
+    <property name="solid" type="bool" value="true"/>
+   </properties>
+  </tile>
+ </tileset>
+ <layer id="1" name="collideable" width="8" height="8">
+  <data encoding="csv">
+   <chunk x="0" y="0" width="4" height="4">
+0,0,0,0,
+0,0,0,0,
+0,0,0,2,
+0,1,0,0
+</chunk>
+   <chunk x="-4" y="-4" width="4" height="4">
+2,0,0,0,
+0,0,0,0,
+0,0,0,0,
+0,0,0,0
+</chunk>
+  </data>
+ </layer>
+</map>
+"""
+
+# a map with one object of a Tiled class (a record when loaded with object_records) and one without
+OBJECTS_MAP = """<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.10" orientation="orthogonal" renderorder="right-down" width="4" height="4"
+     tilewidth="16" tileheight="16" infinite="0" nextlayerid="2" nextobjectid="3">
+ <objectgroup id="1" name="triggers">
+  <object id="1" name="room_1" type="Door" x="16" y="32" width="8" height="16">
+   <properties>
+    <property name="text" value="enter"/>
+    <property name="locked" type="bool" value="true"/>
+   </properties>
+  </object>
+  <object id="2" name="spawn" x="4" y="8"/>
+ </objectgroup>
+</map>
+"""
+
+
+def write_map(text, suffix=".tmx"):
+    fd, filename = tempfile.mkstemp(suffix=suffix)
+    with os.fdopen(fd, "w") as fp:
+        fp.write(text)
+    return filename
+
+
+# custom types of the project the map below belongs to, Outer has a member of class Inner
+CUSTOM_TYPES = [
+    {
+        "type": "class",
+        "name": "Inner",
+        "members": [
+            {"name": "power", "type": "int", "value": 1},
+            {"name": "label", "type": "string", "value": "none"},
+        ],
+    },
+    {
+        "type": "class",
+        "name": "Outer",
+        "members": [
+            {"name": "speed", "type": "float", "value": 0},
+            {"name": "inner", "type": "class", "propertyType": "Inner", "value": {}},
+        ],
+    },
+]
+
+# the same map saved as tmx and as tmj
+SAVED_MAP_TMX = """<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.10" orientation="orthogonal" renderorder="right-down" width="4" height="2"
+     tilewidth="16" tileheight="16" infinite="0" nextlayerid="3" nextobjectid="3">
+ <properties>
+  <property name="music" value="calm"/>
+ </properties>
+ <tileset firstgid="1" name="tiles" tilewidth="16" tileheight="16" tilecount="2" columns="2">
+  <tile id="1">
+   <properties>
+    <property name="solid" type="bool" value="true"/>
+   </properties>
+  </tile>
+ </tileset>
+ <layer id="1" name="collideable" width="4" height="2">
+  <properties>
+   <property name="depth" type="int" value="2"/>
+  </properties>
+  <data encoding="csv">
+0,1,2,0,
+2,2,0,1
+</data>
+ </layer>
+ <objectgroup id="2" name="triggers">
+  <object id="1" name="room_1" type="Door" x="16" y="32" width="8" height="16">
+   <properties>
+    <property name="config" type="class" propertytype="Outer">
+     <properties>
+      <property name="inner" type="class" propertytype="Inner">
+       <properties>
+        <property name="power" type="int" value="3"/>
+       </properties>
+      </property>
+      <property name="speed" type="float" value="2.5"/>
+     </properties>
+    </property>
+    <property name="text" value="enter"/>
+   </properties>
+  </object>
+  <object id="2" name="spawn" x="4" y="8"/>
+ </objectgroup>
+</map>
+"""
+SAVED_MAP_TMJ = {
+    "type": "map",
+    "version": "1.10",
+    "orientation": "orthogonal",
+    "renderorder": "right-down",
+    "width": 4,
+    "height": 2,
+    "tilewidth": 16,
+    "tileheight": 16,
+    "infinite": False,
+    "nextlayerid": 3,
+    "nextobjectid": 3,
+    "properties": [{"name": "music", "type": "string", "value": "calm"}],
+    "tilesets": [
+        {
+            "firstgid": 1,
+            "name": "tiles",
+            "tilewidth": 16,
+            "tileheight": 16,
+            "tilecount": 2,
+            "columns": 2,
+            "tiles": [{"id": 1, "properties": [{"name": "solid", "type": "bool", "value": True}]}],
+        }
+    ],
+    "layers": [
+        {
+            "id": 1,
+            "name": "collideable",
+            "type": "tilelayer",
+            "width": 4,
+            "height": 2,
+            "x": 0,
+            "y": 0,
+            "opacity": 1,
+            "visible": True,
+            "properties": [{"name": "depth", "type": "int", "value": 2}],
+            "data": [0, 1, 2, 0, 2, 2, 0, 1],
+        },
+        {
+            "id": 2,
+            "name": "triggers",
+            "type": "objectgroup",
+            "draworder": "topdown",
+            "x": 0,
+            "y": 0,
+            "opacity": 1,
+            "visible": True,
+            "objects": [
+                {
+                    "id": 1,
+                    "name": "room_1",
+                    "type": "Door",
+                    "x": 16,
+                    "y": 32,
+                    "width": 8,
+                    "height": 16,
+                    "rotation": 0,
+                    "visible": True,
+                    "properties": [
+                        {
+                            "name": "config",
+                            "type": "class",
+                            "propertytype": "Outer",
+                            "value": {"inner": {"power": 3}, "speed": 2.5},
+                        },
+                        {"name": "text", "type": "string", "value": "enter"},
+                    ],
+                },
+                {
+                    "id": 2,
+                    "name": "spawn",
+                    "type": "",
+                    "x": 4,
+                    "y": 8,
+                    "width": 0,
+                    "height": 0,
+                    "rotation": 0,
+                    "visible": True,
+                },
+            ],
+        },
+    ],
+}
+
+
+def plain(value):
+    """Class property values as dicts, so maps loaded separately can be compared."""
+    if isinstance(value, TiledClassType):
+        return {key: plain(member) for key, member in vars(value).items()}
+    if isinstance(value, dict):
+        return {key: plain(member) for key, member in value.items()}
+    return value
+
+
+class TestJsonMaps(unittest.TestCase):
+    def setUp(self):
+        self.filenames = [
+            write_map(json.dumps(CUSTOM_TYPES), ".json"),
+            write_map(SAVED_MAP_TMX),
+            write_map(json.dumps(SAVED_MAP_TMJ), ".tmj"),
+        ]
+        custom_types, tmx, tmj = self.filenames
+        self.tmx = TiledMap(tmx, custom_property_filename=custom_types)
+        self.tmj = TiledMap(tmj, custom_property_filename=custom_types)
+
+    def tearDown(self):
+        for filename in self.filenames:
+            os.remove(filename)
+
+    def test_map(self):
+        for name in ("width", "height", "tilewidth", "tileheight", "orientation", "infinite"):
+            self.assertEqual(getattr(self.tmj, name), getattr(self.tmx, name), name)
+        self.assertEqual(plain(self.tmj.properties), plain(self.tmx.properties))
+        self.assertEqual(plain(self.tmj.tile_properties), plain(self.tmx.tile_properties))
+
+    def test_layers(self):
+        self.assertEqual(len(self.tmj.layers), len(self.tmx.layers))
+        for tmj_layer, tmx_layer in zip(self.tmj.layers, self.tmx.layers):
+            self.assertIs(type(tmj_layer), type(tmx_layer))
+            for name in ("id", "name", "visible", "opacity", "parallaxx", "parallaxy"):
+                self.assertEqual(getattr(tmj_layer, name), getattr(tmx_layer, name), name)
+            self.assertEqual(plain(tmj_layer.properties), plain(tmx_layer.properties))
+            if isinstance(tmx_layer, TiledTileLayer):
+                self.assertEqual(list(tmj_layer.iter_data()), list(tmx_layer.iter_data()))
+
+    def test_objects(self):
+        tmj_objects = list(self.tmj.objects)
+        tmx_objects = list(self.tmx.objects)
+        self.assertEqual(len(tmj_objects), len(tmx_objects))
+        for tmj_object, tmx_object in zip(tmj_objects, tmx_objects):
+            for name in ("id", "name", "type", "x", "y", "width", "height", "rotation", "gid"):
+                self.assertEqual(getattr(tmj_object, name), getattr(tmx_object, name), name)
+            self.assertEqual(plain(tmj_object.properties), plain(tmx_object.properties))
+
+    def test_nested_class_members(self):
+        config = self.tmj.get_object_by_name("room_1").properties["config"]
+        self.assertEqual(config.speed, 2.5)
+        self.assertEqual((config.inner.power, config.inner.label), (3, "none"))
+
+
+class TestObjectRecords(unittest.TestCase):
+    def setUp(self):
+        self.filename = write_map(OBJECTS_MAP)
+        self.tiled_map = TiledMap(self.filename, object_records=True)
+        self.door = self.tiled_map.get_object_by_name("room_1")
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_only_classed_objects_are_records(self):
+        self.assertIsInstance(self.door, TiledObjectRecord)
+        self.assertNotIsInstance(self.door, TiledObject)
+        self.assertIsInstance(self.tiled_map.get_object_by_name("spawn"), TiledObject)
+
+    def test_attributes(self):
+        self.assertEqual((self.door.id, self.door.name, self.door.type), (1, "room_1", "Door"))
+        self.assertEqual((self.door.x, self.door.y, self.door.width, self.door.height), (16, 32, 8, 16))
+        self.assertEqual(self.door.text, "enter")
+        self.assertIs(self.door.locked, True)
+        self.assertFalse(hasattr(self.door, "__dict__"))
+
+    def test_properties_are_read_only(self):
+        self.assertEqual(dict(self.door.properties), {"text": "enter", "locked": True})
+        with self.assertRaises(TypeError):
+            self.door.properties["text"] = "leave"
+        self.door.text = "leave"
+        self.assertEqual(self.door.properties["text"], "leave")
+
+    def test_pickle(self):
+        door = pickle.loads(pickle.dumps(self.door))
+        self.assertIs(type(door), type(self.door))
+        self.assertEqual(door.fields, self.door.fields)
+        self.assertEqual(dict(door.properties), dict(self.door.properties))
+        self.assertEqual((door.id, door.name, door.x, door.y), (1, "room_1", 16, 32))
+
+
+class TestInfiniteMapTiles(unittest.TestCase):
+    def setUp(self):
+        self.filename = write_map(INFINITE_MAP)
+        self.tiled_map = TiledMap(self.filename)
+        self.layer = self.tiled_map.get_layer_by_name("collideable")
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_layer_get_gid_reads_chunks(self):
+        self.assertTrue(self.layer.chunks)
+        solid = self.layer.get_gid(3, 2)
+        self.assertEqual(self.tiled_map.tiledgidmap[solid], 2)
+        self.assertEqual(self.layer.get_gid(-4, -4), solid)
+        self.assertEqual(self.tiled_map.tiledgidmap[self.layer.get_gid(1, 3)], 1)
+        self.assertEqual(self.layer.get_gid(0, 0), 0)
+
+    def test_layer_get_gid_outside_chunks_is_empty(self):
+        self.assertEqual(self.layer.get_gid(20, 20), 0)
+        self.assertEqual(self.layer.get_gid(-1, 2), 0)
+
+    def test_get_tile_gid(self):
+        self.assertEqual(self.tiled_map.get_tile_gid(3, 2, 0), self.layer.get_gid(3, 2))
+        self.assertEqual(self.tiled_map.get_tile_gid(0, 0, 0), 0)
+
+    def test_get_tile_properties(self):
+        self.assertEqual(self.tiled_map.get_tile_properties(3, 2, 1)["solid"], True)
+        self.assertIsNone(self.tiled_map.get_tile_properties(1, 3, 1))
+
+    def test_get_tile_image(self):
+        # the default image loader loads nothing, but the lookup must still find the tile's image slot
+        gid = self.layer.get_gid(3, 2)
+        self.assertEqual(self.tiled_map.get_tile_image(3, 2, 0), self.tiled_map.images[gid])
+
+    def test_build_rects(self):
+        rects = build_rects(self.tiled_map, "collideable", None, None)
+        self.assertEqual(
+            sorted(tuple(rect) for rect in rects),
+            [(-64, -64, 16, 16), (16, 48, 16, 16), (48, 32, 16, 16)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()